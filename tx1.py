@@ -1,28 +1,405 @@
 import os
+import re
+import sys
+import bisect
+import gzip
+import mmap
+import shutil
+import csv
+import contextlib
+import json
+import sqlite3
+import itertools
+import time
+import random
+import atexit
+import tempfile
+import threading
 import functools
+from collections import Counter, OrderedDict, deque, namedtuple
 from pathlib import Path
 import logging
 from datetime import datetime
 
-# Определяем рабочую директорию относительно домашнего каталога пользователя
-base_dir = Path.home() / "stepik_application"  # Директория для приложения
-log_dir = base_dir / "logs"  # Директория для логов
-log_dir.mkdir(parents=True, exist_ok=True)  # Создаем папку для логов, если она не существует
+class AppContext:
+    """
+    Каталоги и хранилище приложения. Ничего не создается при импорте: каталоги создаются
+    при первом обращении, а текущая директория процесса не меняется.
+    Базовый каталог: аргумент base_dir, переменная окружения STEPIK_APP_DIR или ~/stepik_application.
+    """
 
-# Переключаемся в рабочую директорию приложения
-os.chdir(base_dir)
-print("Рабочая директория:", os.getcwd())
+    def __init__(self, base_dir=None) -> None:
+        self.configure(base_dir)
 
-# Создаем папку "application" при необходимости
-app_dir = base_dir / "application"
-app_dir.mkdir(parents=True, exist_ok=True)
-os.chdir(app_dir)
-print("Директория приложения:", os.getcwd())
+    def configure(self, base_dir=None) -> None:
+        """Задает базовый каталог; каталоги и хранилище будут созданы заново при обращении."""
+        self._base_dir = Path(base_dir) if base_dir is not None else None
+        self._ready = False
+        self._storage = None
+
+    @property
+    def base_dir(self) -> Path:
+        if self._base_dir is None:
+            self._base_dir = Path(os.environ.get("STEPIK_APP_DIR") or Path.home() / "stepik_application")
+        return self._base_dir
+
+    def init(self) -> "AppContext":
+        if not self._ready:
+            (self.base_dir / "logs").mkdir(parents=True, exist_ok=True)  # Логи вызовов методов
+            (self.base_dir / "application").mkdir(parents=True, exist_ok=True)  # Файлы пользователей
+            self._ready = True
+        return self
+
+    @property
+    def log_dir(self) -> Path:
+        return self.init().base_dir / "logs"
+
+    @property
+    def app_dir(self) -> Path:
+        return self.init().base_dir / "application"
+
+    def resolve(self, path) -> Path:
+        """Относительные пути считаются от каталога приложения (раньше он был текущей директорией)."""
+        path = Path(path)
+        return path if path.is_absolute() else self.app_dir / path
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            self._storage = CachedStorage(SQLiteStorage(self.base_dir / "users.db"))
+        return self._storage
+
+
+app = AppContext()
+
+
+class BatchLogWriter:
+    """
+    Фоновый поток, который пишет записи логов пачками.
+    Записи копятся в ограниченной очереди и сбрасываются в файлы, когда набирается
+    batch_size записей или проходит flush_interval секунд. При переполнении очереди
+    policy="block" заставляет вызывающий поток ждать, policy="drop" отбрасывает запись.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=1.0, max_queue=10000, policy="block"):
+        if policy not in ("block", "drop"):
+            raise ValueError("policy должен быть 'block' или 'drop'")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.policy = policy
+        self.dropped = 0
+        # deque.append атомарен и не берет блокировку: вызывающий поток платит только за добавление,
+        # а писателя будит событие, когда набирается пачка
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._space = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="BatchLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, handler, record) -> None:
+        buffer = self._buffer
+        if len(buffer) >= self.max_queue:
+            if self.policy == "drop":
+                self.dropped += 1
+                return
+            self._wake.set()
+            with self._space:
+                while len(buffer) >= self.max_queue and self._thread.is_alive():
+                    self._space.wait(0.1)
+        buffer.append((handler, record))
+        if len(buffer) >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Дожидается записи на диск всего, что уже попало в очередь."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._buffer.append((None, done))
+            self._wake.set()
+            done.wait()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._buffer.append((None, None))
+            self._wake.set()
+            self._thread.join()
+
+    def _run(self) -> None:
+        buffer = self._buffer
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            pending = {}  # путь к файлу -> список строк
+            stop = False
+            while buffer:
+                handler, record = buffer.popleft()
+                if handler is None:
+                    # Метка flush() или close(): сначала пишем все, что было до нее
+                    self._write(pending)
+                    pending = {}
+                    if record is None:
+                        stop = True
+                    else:
+                        record.set()
+                    continue
+                # Форматирование выполняется здесь, а не в вызывающем потоке
+                pending.setdefault(handler.baseFilename, []).append(handler.format(record))
+            self._write(pending)
+            with self._space:
+                self._space.notify_all()
+            if stop:
+                return
+
+    @staticmethod
+    def _write(pending) -> None:
+        for path, lines in pending.items():
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                logging.error(f"Ошибка при записи лога {path}: {e}")
+
+
+class BatchFileHandler(logging.Handler):
+    """Обработчик, который передает записи в BatchLogWriter вместо записи в файл."""
+
+    def __init__(self, filename, writer: BatchLogWriter) -> None:
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.writer = writer
+
+    def emit(self, record) -> None:
+        self.writer.put(self, record)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+
+class RotatingLogHandler(logging.FileHandler):
+    """
+    Файловый обработчик с ротацией по размеру (max_bytes) и/или времени (interval, секунды).
+    Закрытый сегмент переименовывается в <лог>.<ГГГГММДД-ччммсс>, сжимается gzip в фоновом потоке,
+    после чего старые сегменты удаляются: остается не больше backup_count и не старше max_age секунд.
+    """
+
+    def __init__(self, filename, max_bytes=None, interval=None, backup_count=10, max_age=None, compress=True) -> None:
+        super().__init__(filename, mode="a", encoding="utf-8")
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.max_age = max_age
+        self.compress = compress
+        self.rollover_at = time.time() + interval if interval else None
+        # Сжатие и удаление сегментов одного лога идут по очереди, даже из разных обработчиков
+        self._archive_lock = self._archive_locks.setdefault(self.baseFilename, threading.Lock())
+
+    _archive_locks = {}
+
+    def should_rollover(self, message) -> bool:
+        """message — уже отформатированная запись: emit форматирует ее один раз и для проверки, и для записи."""
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.seek(0, 2)
+            return self.stream.tell() + len(message) + len(self.terminator) > self.max_bytes
+        return False
+
+    def emit(self, record) -> None:
+        try:
+            message = self.format(record)
+            if self.should_rollover(message):
+                self.do_rollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(message + self.terminator)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def do_rollover(self) -> None:
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            segment = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}"
+            number = 0
+            while os.path.exists(segment) or os.path.exists(segment + ".gz"):
+                number += 1
+                segment = f"{self.baseFilename}.{time.strftime('%Y%m%d-%H%M%S')}.{number}"
+            if os.path.exists(self.baseFilename):
+                os.rename(self.baseFilename, segment)
+            # Индекс относится к живому файлу и после ротации недействителен
+            Path(self.baseFilename + ".idx").unlink(missing_ok=True)
+            self.stream = self._open()
+            if self.interval:
+                self.rollover_at = time.time() + self.interval
+        finally:
+            self.release()
+        # Поток не фоновый (daemon=False): close() его не ждет, а интерпретатор при выходе дождется
+        # конца сжатия, и недописанный .gz.tmp не останется
+        threading.Thread(target=self._archive, args=(segment,)).start()
+
+    def _archive(self, segment) -> None:
+        with self._archive_lock:
+            # Остатки сжатия, прерванного прошлым запуском: исходный сегмент цел, сожмем его заново
+            base = Path(self.baseFilename)
+            pending = [segment]
+            for stale in base.parent.glob(base.name + ".*.gz.tmp"):
+                stale.unlink(missing_ok=True)
+                pending.append(str(stale)[:-len(".gz.tmp")])
+            for path in pending:
+                if self.compress and os.path.exists(path):
+                    with open(path, "rb") as src, gzip.open(path + ".gz.tmp", "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.replace(path + ".gz.tmp", path + ".gz")
+                    os.remove(path)
+            segments = log_segments(self.baseFilename)[:-1]
+            expired = segments[:-self.backup_count] if self.backup_count else segments
+            if self.max_age:
+                expired += [path for path in segments if time.time() - os.path.getmtime(path) > self.max_age]
+            for path in set(expired):
+                Path(path).unlink(missing_ok=True)
+
+
+def log_segments(path) -> list:
+    """Сегменты лога от старых к новым (сжатые и нет), последним — живой файл."""
+    path = Path(path)
+    segments = {}
+    for segment in path.parent.glob(path.name + ".*"):
+        if segment.name.endswith((".idx", ".tmp")):
+            continue
+        key = segment.name[:-3] if segment.name.endswith(".gz") else segment.name
+        # Если сжатие еще не завершено, читаем несжатый сегмент
+        if key not in segments or not segment.name.endswith(".gz"):
+            segments[key] = segment
+    def order(name):
+        stamp, _, number = name[len(path.name) + 1:].partition(".")
+        return stamp, int(number or 0)
+
+    ordered = [segments[key] for key in sorted(segments, key=order)]
+    return ordered + ([path] if path.exists() else [])
+
+
+def _segment_time(segment, path) -> str:
+    """Время ротации сегмента в формате записей лога (верхняя граница времени его записей)."""
+    stamp = segment.name[len(path.name) + 1:].split(".")[0]
+    return datetime.strptime(stamp, "%Y%m%d-%H%M%S").strftime("%Y-%m-%d %H:%M:%S")
+
+
+class LazyRepr:
+    """Откладывает repr() аргументов до форматирования записи обработчиком и обрезает длинные значения."""
+
+    __slots__ = ("value", "max_length")
+
+    def __init__(self, value, max_length=None) -> None:
+        self.value = value
+        self.max_length = max_length
+
+    def __str__(self) -> str:
+        text = repr(self.value)
+        if self.max_length is not None and len(text) > self.max_length:
+            text = text[:self.max_length] + f"... (+{len(text) - self.max_length} симв.)"
+        return text
+
+
+class PooledLogger(logging.Logger):
+    """Логгер вне реестра logging: кэш уровней сбрасывается им самим, а не менеджером."""
+
+    def setLevel(self, level) -> None:
+        super().setLevel(level)
+        self._cache.clear()
+
+
+class LoggerPool:
+    """
+    Ограниченный LRU пул логгеров пользователей, общий для всех декораторов Logger.
+    Логгеры не регистрируются в logging.getLogger, поэтому не копятся в глобальном реестре.
+    При превышении max_open или простое дольше idle_timeout секунд обработчик закрывается
+    (освобождая дескриптор), а при следующем обращении логгер создается заново.
+    """
+
+    def __init__(self, max_open=256, idle_timeout=None) -> None:
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._loggers = OrderedDict()  # ключ -> [логгер, время последнего обращения]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._loggers)
+
+    def get(self, key, name, make_handler) -> logging.Logger:
+        """Возвращает логгер по ключу, создавая его с обработчиком make_handler(name) при промахе."""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            entry = self._loggers.get(key)
+            if entry is not None:
+                self._loggers.move_to_end(key)
+                entry[1] = now
+                if self.idle_timeout is None:
+                    return entry[0]
+            else:
+                entry = [PooledLogger(name, logging.INFO), now]
+                entry[0].parent = logging.root  # Записи, как и раньше, передаются корневому логгеру
+                entry[0].addHandler(make_handler(name))
+                self._loggers[key] = entry
+            while self._loggers:
+                oldest_key, (oldest, last_used) = next(iter(self._loggers.items()))
+                idle = self.idle_timeout is not None and now - last_used > self.idle_timeout
+                if len(self._loggers) <= self.max_open and not idle:
+                    break
+                del self._loggers[oldest_key]
+                evicted.append(oldest)
+        # Закрытие обработчика (сброс буфера, файл) идет уже без блокировки пула
+        for user_logger in evicted:
+            self._close(user_logger)
+        return entry[0]
+
+    def close(self, key=None) -> None:
+        """Закрывает обработчик одного логгера или, без аргумента, всех логгеров пула."""
+        with self._lock:
+            keys = list(self._loggers) if key is None else [key]
+            entries = [self._loggers.pop(logger_key, None) for logger_key in keys]
+        for entry in entries:
+            if entry is not None:
+                self._close(entry[0])
+
+    @staticmethod
+    def _close(user_logger) -> None:
+        for handler in user_logger.handlers[:]:
+            handler.close()
+            user_logger.removeHandler(handler)
+
+
+# Общий пул логгеров пользователей
+logger_pool = LoggerPool()
 
 
 class Logger:
-    def __init__(self):
-        self.loggers = {}
+    def __init__(self, log_dir=None, queued=False, sample_rates=None, max_length=None, rotation=None,
+                 pool=None, **writer_options):
+        """
+        queued=True включает пакетную запись логов в фоновом потоке;
+        writer_options передаются в BatchLogWriter (batch_size, flush_interval, max_queue, policy).
+        sample_rates задает долю логируемых вызовов по имени метода (например {"write_data": 0.1}),
+        max_length ограничивает длину выводимых аргументов.
+        rotation — параметры RotatingLogHandler (max_bytes, interval, backup_count, max_age)
+        для файлов без очереди.
+        pool — LoggerPool с открытыми логгерами (по умолчанию общий logger_pool).
+        """
+        self.pool = pool if pool is not None else logger_pool
+        self.rotation = rotation
+        self.log_dir = Path(log_dir) if log_dir is not None else None
+        self.writer = BatchLogWriter(**writer_options) if queued else None
+        self.sample_rates = sample_rates or {}
+        self.max_length = max_length
 
     def __call__(self, cls):
         """Декоратор для логирования методов класса."""
@@ -32,151 +409,788 @@ class Logger:
         return cls
 
     def get_logger(self, instance):
-        if instance.name not in self.loggers:
-            log_file_path = log_dir / f"{instance.name}_log.log"
-            user_logger = logging.getLogger(instance.name)
-            user_logger.setLevel(logging.INFO)
-            if not user_logger.handlers:
-                file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
-                formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s",
-                                              datefmt="%Y-%m-%d %H:%M:%S")
-                file_handler.setFormatter(formatter)
-                user_logger.addHandler(file_handler)
-            self.loggers[instance.name] = user_logger
-        return self.loggers[instance.name]
+        return self.pool.get((self.log_dir, instance.name), instance.name, self.make_handler)
+
+    def make_handler(self, name) -> logging.Handler:
+        log_file_path = (self.log_dir or app.log_dir) / f"{name}_log.log"
+        if self.writer is not None:
+            file_handler = BatchFileHandler(log_file_path, self.writer)
+        elif self.rotation:
+            file_handler = RotatingLogHandler(log_file_path, **self.rotation)
+        else:
+            file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
+        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s",
+                                      datefmt="%Y-%m-%d %H:%M:%S")
+        file_handler.setFormatter(formatter)
+        return file_handler
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
 
     def log_method(self, method):
         """Декоратор для логирования вызовов метода"""
+        sample_rate = self.sample_rates.get(method.__name__, 1.0)
+        max_length = self.max_length
+
         @functools.wraps(method)
         def wrapper(*args, **kwargs):
             instance = args[0]
             logger = self.get_logger(instance)
-            log_message = (f"Метод: {method.__name__}\nАргументы: {args[1:]}\nКлючевые аргументы: {kwargs}\n")
-            logger.info(log_message)
+            # Сообщение строится только если INFO включен и вызов попал в выборку
+            if logger.isEnabledFor(logging.INFO) and (sample_rate >= 1.0 or random.random() < sample_rate):
+                logger.info("Метод: %s\nАргументы: %s\nКлючевые аргументы: %s\n", method.__name__,
+                            LazyRepr(args[1:], max_length), LazyRepr(kwargs, max_length))
             return method(*args, **kwargs)
         return wrapper
 
 
-@Logger()
-class User:
-    def __init__(self, name: str, **kwargs) -> None:
-        self.name = name
-        self.user_dir = base_dir / "Users"  # Каталог для данных пользователей
-        self.save_user_info(**kwargs)
-        self.load()
+class TextFileStorage:
+    """Хранилище профилей в виде отдельных файлов Users/<имя>.txt (формат ключ=значение)."""
 
-    def _get_user_file_path(self) -> Path:
-        return self.user_dir / f"{self.name}.txt"
+    def __init__(self, user_dir: Path) -> None:
+        self.user_dir = Path(user_dir)
 
-    def load(self) -> None:
-        user_file_path = self._get_user_file_path()
+    def _get_path(self, name: str) -> Path:
+        return self.user_dir / f"{name}.txt"
+
+    def names(self) -> list:
+        if not self.user_dir.exists():
+            return []
+        return sorted(p.stem for p in self.user_dir.glob("*.txt"))
+
+    def exists(self, name: str) -> bool:
+        return self._get_path(name).exists()
+
+    def load(self, name: str) -> dict:
+        data = {}
+        user_file_path = self._get_path(name)
         if user_file_path.exists():
             with user_file_path.open("r", encoding="utf-8") as f:
                 for line in f:
                     if line.strip():
                         try:
                             key, value = line.strip().split("=", 1)
-                            setattr(self, key.strip(), value.strip())
+                            data[key.strip()] = value.strip()
                         except ValueError:
                             logging.error(f"Ошибка при чтении строки: {line.strip()}. Пропуск.")
-            logging.info(f"Данные для пользователя {self.name} загружены.")
-        else:
-            logging.warning(f"Файл для пользователя {self.name} не найден. Создается новый.")
+        return data
+
+    def replace(self, name: str, data: dict) -> None:
+        self.user_dir.mkdir(parents=True, exist_ok=True)
+        with self._get_path(name).open("w", encoding="utf-8") as f:
+            for key, value in data.items():
+                f.write(f"{key}={value}\n")
 
-    def save_user_info(self, **kwargs) -> None:
-        self.user_dir.mkdir(exist_ok=True)
-        user_file_path = self._get_user_file_path()
-        current_data = {}
+    def update(self, name: str, data: dict) -> dict:
+        current_data = self.load(name)
+        current_data.update(data)
+        self.replace(name, current_data)
+        return current_data
+
+    def delete(self, name: str) -> bool:
+        user_file_path = self._get_path(name)
         if user_file_path.exists():
-            with user_file_path.open("r", encoding="utf-8") as f:
+            os.remove(user_file_path)
+            return True
+        return False
+
+
+class SQLiteStorage:
+    """
+    Хранилище всех профилей в одном файле sqlite3.
+    Каждая пара ключ=значение — отдельная строка с первичным ключом (name, key),
+    поэтому поиск пользователя идет по индексу, а обновление затрагивает только измененные ключи.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._conn = None
+        # Одно соединение на процесс, доступ из потоков пакетных операций — под блокировкой
+        self._lock = threading.RLock()
+        self._depth = 0  # вложенность transaction()
+        self._connections = 0  # номер соединения: data_version разных соединений не сравнимы
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._connections += 1
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS user_info ("
+                "name TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (name, key)) WITHOUT ROWID"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _get_path(self, name: str) -> Path:
+        return self.db_path
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """Соединение для изменения: вне transaction() каждое изменение фиксируется сразу."""
+        conn = self._connect()
+        if self._depth:
+            yield conn
+        else:
+            with conn:
+                yield conn
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Все изменения внутри блока фиксируются вместе или откатываются при исключении.
+        Вложенный блок — точка сохранения: его откат не отменяет внешний. Другие потоки
+        ждут конца транзакции и не видят промежуточного состояния.
+        """
+        with self._lock:
+            conn = self._connect()
+            depth = self._depth
+            savepoint = f"batch_{depth}"
+            conn.execute("BEGIN IMMEDIATE" if depth == 0 else f"SAVEPOINT {savepoint}")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if depth == 0:
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                if depth == 0:
+                    conn.commit()
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+            finally:
+                self._depth = depth
+
+    def data_version(self) -> tuple:
+        """(номер соединения, PRAGMA data_version): меняется, когда изменения фиксирует другое соединение."""
+        with self._lock:
+            version = self._connect().execute("PRAGMA data_version").fetchone()[0]
+            return self._connections, version
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def names(self) -> list:
+        with self._lock:
+            rows = self._connect().execute("SELECT DISTINCT name FROM user_info ORDER BY name")
+            return [row[0] for row in rows]
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM user_info WHERE name = ? LIMIT 1", (name,)
+            ).fetchone()
+        return row is not None
+
+    def load(self, name: str) -> dict:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key, value FROM user_info WHERE name = ?", (name,)
+            )
+            return dict(rows.fetchall())
+
+    def replace(self, name: str, data: dict) -> None:
+        with self._lock:
+            with self._writing() as conn:
+                conn.execute("DELETE FROM user_info WHERE name = ?", (name,))
+                conn.executemany(
+                    "INSERT INTO user_info (name, key, value) VALUES (?, ?, ?)",
+                    [(name, str(k), str(v)) for k, v in data.items()],
+                )
+
+    def update(self, name: str, data: dict) -> dict:
+        with self._lock:
+            with self._writing() as conn:
+                conn.executemany(
+                    "INSERT INTO user_info (name, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (name, key) DO UPDATE SET value = excluded.value",
+                    [(name, str(k), str(v)) for k, v in data.items()],
+                )
+            return self.load(name)
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            with self._writing() as conn:
+                cursor = conn.execute("DELETE FROM user_info WHERE name = ?", (name,))
+            return cursor.rowcount > 0
+
+
+class FileCache:
+    """
+    Ограниченный LRU кэш данных, прочитанных из файлов.
+    Запись действительна, пока у файла не изменились st_mtime_ns и размер (или переданная в get
+    отметка версии), поэтому изменения файлов (в том числе другими процессами) сбрасывают кэш автоматически.
+    Файлы больше max_file_size не кэшируются.
+    """
+
+    def __init__(self, max_entries=256, max_file_size=1 << 20) -> None:
+        self.max_entries = max_entries
+        self.max_file_size = max_file_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # (путь, ключ) -> ((st_mtime_ns, st_size), значение)
+        self._lock = threading.Lock()
+
+    def get(self, path, loader, key=None, version=None):
+        """
+        Возвращает loader(path) из кэша или читает заново. FileNotFoundError пробрасывается.
+        version — готовая отметка версии данных вместо st_mtime_ns и размера файла.
+        """
+        cache_key = (os.path.abspath(path), key)
+        if version is not None:
+            signature, size = version, 0
+        else:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self.invalidate(path)
+                raise
+            signature, size = (st.st_mtime_ns, st.st_size), st.st_size
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader(path)
+        if size <= self.max_file_size:
+            with self._lock:
+                self._entries[cache_key] = (signature, value)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, path=None, key=None) -> None:
+        """Удаляет записи файла (или одну запись с ключом key). Без аргументов очищает кэш целиком."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(path)
+            for cache_key in list(self._entries):
+                if cache_key[0] == path and (key is None or cache_key[1] == key):
+                    del self._entries[cache_key]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries)}
+
+
+# Общий для процесса кэш профилей и файлов данных
+file_cache = FileCache()
+
+
+class CachedStorage:
+    """Обертка над хранилищем профилей, которая читает профили через FileCache."""
+
+    def __init__(self, storage, cache: FileCache = file_cache) -> None:
+        self.storage = storage
+        self.cache = cache
+        if hasattr(storage, "transaction"):
+            # transaction() есть у обертки, только если ее поддерживает само хранилище
+            self.transaction = self._transaction
+
+    def _get_path(self, name: str) -> Path:
+        return self.storage._get_path(name)
+
+    def names(self) -> list:
+        return self.storage.names()
+
+    def exists(self, name: str) -> bool:
+        return bool(self.load(name))
+
+    def load(self, name: str) -> dict:
+        # У SQLite файл один на всех: его отметка менялась бы при любой записи. Свои изменения
+        # сбрасывают запись по имени, чужие (другие процессы) — меняют data_version
+        data_version = getattr(self.storage, "data_version", None)
+        version = data_version() if data_version is not None else None
+        try:
+            data = self.cache.get(self._get_path(name), lambda path: self.storage.load(name), key=name,
+                                  version=version)
+        except FileNotFoundError:
+            return {}
+        return dict(data)
+
+    def replace(self, name: str, data: dict) -> None:
+        self.cache.invalidate(self._get_path(name), key=name)
+        self.storage.replace(name, data)
+
+    def update(self, name: str, data: dict) -> dict:
+        self.cache.invalidate(self._get_path(name), key=name)
+        return self.storage.update(name, data)
+
+    def delete(self, name: str) -> bool:
+        self.cache.invalidate(self._get_path(name), key=name)
+        return self.storage.delete(name)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        try:
+            with self.storage.transaction():
+                yield self
+        except BaseException:
+            # Внутри транзакции в кэш могли попасть незафиксированные профили
+            self.cache.invalidate()
+            raise
+
+
+def read_text(path) -> str:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return f.read()
+
+
+def iter_lines(path, offset=0, limit=None):
+    """Построчно отдает файл, пропуская offset строк и выдавая не больше limit строк."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        stop = None if limit is None else offset + limit
+        for line in itertools.islice(f, offset, stop):
+            yield line.rstrip("\n")
+
+
+def tail_lines(path, n=10) -> list:
+    """Возвращает последние n строк файла, просматривая его с конца через mmap."""
+    if n <= 0 or os.path.getsize(path) == 0:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = len(mm)
+        if mm[end - 1:end] == b"\n":
+            end -= 1
+        start = end
+        for _ in range(n):
+            start = mm.rfind(b"\n", 0, start)
+            if start == -1:
+                break
+        return mm[start + 1:end].decode("utf-8", errors="replace").split("\n")
+
+
+def read_range(path, start, length) -> bytes:
+    """Читает length байт начиная с позиции start без чтения всего файла (mmap)."""
+    size = os.path.getsize(path)
+    if start >= size or length <= 0:
+        return b""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm[start:start + length]
+
+
+def stream_file(path, offset=0, limit=None, tail=None):
+    """Генератор строк файла: последние tail строк или диапазон offset/limit."""
+    if tail is not None:
+        yield from tail_lines(path, tail)
+    else:
+        yield from iter_lines(path, offset, limit)
+
+
+def page_lines(lines, page_size=20) -> None:
+    """Постранично выводит строки, ожидая Enter перед следующей страницей (q — выход)."""
+    for number, line in enumerate(lines, 1):
+        print(line)
+        if number % page_size == 0 and input("-- Enter — далее, q — выход --").strip().lower() == "q":
+            break
+
+
+class AppendWriter:
+    """
+    Запись строк в конец файлов через пул открытых дескрипторов.
+    Вне блока `with writer:` каждая строка записывается сразу; внутри блока строки копятся
+    и записываются группой (по batch_size строк или при выходе из блока).
+    durability: "none" — без fsync, "batch" — fsync после каждой группы,
+    "interval" — fsync не чаще одного раза в fsync_interval секунд.
+    """
+
+    def __init__(self, max_open=64, batch_size=1000, durability="none", fsync_interval=1.0) -> None:
+        if durability not in ("none", "batch", "interval"):
+            raise ValueError("durability должен быть 'none', 'batch' или 'interval'")
+        self.max_open = max_open
+        self.batch_size = batch_size
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self._handles = OrderedDict()  # путь -> открытый файл (LRU)
+        self._buffers = {}  # путь -> список строк
+        self._pending = 0
+        self._depth = 0
+        self._last_fsync = time.monotonic()
+        self._lock = threading.RLock()
+        atexit.register(self.close)
+
+    def __enter__(self):
+        with self._lock:
+            self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0:
+                self.flush()
+
+    def write(self, path, line: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            self._buffers.setdefault(path, []).append(line + "\n")
+            self._pending += 1
+            if self._depth == 0 or self._pending >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Записывает буферы всех файлов; ошибка одного файла не мешает остальным и поднимается после них."""
+        with self._lock:
+            written = []
+            error = None
+            try:
+                while self._buffers:
+                    # Строки забираются из буфера до записи: при ошибке они не повторятся в следующих flush()
+                    path = next(iter(self._buffers))
+                    lines = self._buffers.pop(path)
+                    try:
+                        handle = self._get_handle(path)
+                        handle.write("".join(lines))
+                        handle.flush()
+                        written.append(handle)
+                    except Exception as e:
+                        broken = self._handles.pop(path, None)
+                        if broken is not None:
+                            broken.close()
+                        if error is None:
+                            error = e
+                        else:
+                            logging.error(f"Ошибка при записи {path}: {e}")
+            finally:
+                self._pending = 0
+            if self.durability == "batch":
+                for handle in written:
+                    os.fsync(handle.fileno())
+            elif self.durability == "interval" and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                for handle in self._handles.values():
+                    os.fsync(handle.fileno())
+                self._last_fsync = time.monotonic()
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            for handle in self._handles.values():
+                if self.durability != "none":
+                    os.fsync(handle.fileno())
+                handle.close()
+            self._handles.clear()
+
+    def release(self, path=None) -> None:
+        """Записывает буфер и закрывает дескриптор файла (без аргумента — все дескрипторы), например перед переименованием."""
+        with self._lock:
+            self.flush()
+            paths = list(self._handles) if path is None else [os.path.abspath(path)]
+            for handle_path in paths:
+                handle = self._handles.pop(handle_path, None)
+                if handle is not None:
+                    handle.close()
+
+    def _get_handle(self, path):
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        handle = open(path, "a", encoding="utf-8")
+        self._handles[path] = handle
+        while len(self._handles) > self.max_open:
+            _, oldest = self._handles.popitem(last=False)
+            if self.durability != "none":
+                os.fsync(oldest.fileno())
+            oldest.close()
+        return handle
+
+
+# Общий пул дескрипторов для write_data и create_log
+data_writer = AppendWriter()
+
+
+LOG_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([A-Z]+) - (.*)$")
+METHOD_LINE = re.compile(r"^Метод: (\w+)")
+LogEntry = namedtuple("LogEntry", "user time level method message offset")
+
+
+def iter_log_entries(path, start=0, user=None):
+    """
+    Потоково разбирает лог-файл Logger на записи, начиная с байтовой позиции start.
+    Строки без отметки времени считаются продолжением предыдущей записи.
+    """
+    with (gzip.open(path, "rb") if str(path).endswith(".gz") else open(path, "rb")) as f:
+        f.seek(start)
+        offset = start
+        current = None
+        for raw in f:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            match = LOG_LINE.match(line)
+            if match:
+                if current is not None:
+                    yield _make_log_entry(user, current)
+                current = (offset, match.group(1), match.group(2), [match.group(3)])
+            elif current is not None:
+                current[3].append(line)
+            offset += len(raw)
+        if current is not None:
+            yield _make_log_entry(user, current)
+
+
+def _make_log_entry(user, current) -> LogEntry:
+    offset, time_str, level, lines = current
+    method = METHOD_LINE.match(lines[0])
+    return LogEntry(user, time_str, level, method.group(1) if method else "", "\n".join(lines).rstrip(), offset)
+
+
+class LogIndex:
+    """
+    Разреженный индекс времени лог-файла: каждая step-я запись сохраняется в файле <лог>.idx
+    как (номер записи, время, смещение). Индекс дописывается по мере роста лога
+    и перестраивается, если файл стал короче (например, после ротации).
+    """
+
+    def __init__(self, path, step=1000) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.step = step
+
+    def _load(self):
+        try:
+            with self.index_path.open("r", encoding="utf-8") as f:
+                size = int(f.readline())
+                points = []
                 for line in f:
-                    if line.strip():
-                        try:
-                            key, value = line.strip().split("=", 1)
-                            current_data[key.strip()] = value.strip()
-                        except ValueError:
-                            logging.error(f"Ошибка при чтении строки: {line.strip()}. Пропуск.")
-        current_data["name"] = self.name
-        for key, value in kwargs.items():
-            current_data[key] = value
-        with user_file_path.open("w", encoding="utf-8") as f:
-            for key, value in current_data.items():
-                f.write(f"{key}={value}\n")
-        logging.info(f"Информация о пользователе {self.name} сохранена в файл.")
+                    number, time_str, offset = line.rstrip("\n").split("\t")
+                    points.append((int(number), time_str, int(offset)))
+                return size, points
+        except (FileNotFoundError, ValueError):
+            return 0, []
+
+    def points(self) -> list:
+        """Возвращает точки индекса, при необходимости дописывая их для новых записей."""
+        indexed_size, points = self._load()
+        size = os.path.getsize(self.path)
+        if size == indexed_size:
+            return points
+        if size < indexed_size:
+            points = []
+        number, _, offset = points[-1] if points else (0, "", 0)
+        for position, entry in enumerate(iter_log_entries(self.path, offset), number):
+            if position % self.step == 0 and (not points or position > points[-1][0]):
+                points.append((position, entry.time, entry.offset))
+        with self.index_path.open("w", encoding="utf-8") as f:
+            f.write(f"{size}\n")
+            for point in points:
+                f.write("%d\t%s\t%d\n" % point)
+        return points
+
+    def start_offset(self, since) -> int:
+        """Смещение, с которого достаточно начать чтение, чтобы не пропустить записи новее since."""
+        points = self.points()
+        position = bisect.bisect_left([point[1] for point in points], since)
+        return points[position - 1][2] if position > 0 else 0
+
+
+def _format_log_time(value):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def _search_log_file(path, user, method, level, since, until, use_index) -> list:
+    result = []
+    for segment in log_segments(path):
+        if segment == path:
+            start = LogIndex(path).start_offset(since) if use_index and since else 0
+        else:
+            # Все записи сегмента старше момента его ротации
+            if since and _segment_time(segment, path) < since:
+                continue
+            start = 0
+        for entry in iter_log_entries(segment, start, user):
+            if since and entry.time < since:
+                continue
+            if until and entry.time > until:
+                break
+            if method and entry.method != method:
+                continue
+            if level and entry.level != level:
+                continue
+            result.append(entry)
+    return result
+
+
+def search_logs(users=None, method=None, level=None, since=None, until=None,
+                logs_path=None, use_index=True, workers=None) -> list:
+    """
+    Ищет записи в логах Logger (<имя>_log.log и их сегментах после ротации) по пользователям, методу, уровню и интервалу времени.
+    since/until — datetime или строка "ГГГГ-ММ-ДД чч:мм:сс". Несколько файлов просматриваются
+    параллельно в пуле процессов (workers=1 отключает пул).
+    """
+    logs_path = Path(logs_path) if logs_path is not None else app.log_dir
+    since, until = _format_log_time(since), _format_log_time(until)
+    if users is None:
+        files = sorted(logs_path.glob("*_log.log"))
+    else:
+        files = [logs_path / f"{user}_log.log" for user in users]
+        files = [path for path in files if path.is_file()]
+    jobs = [(path, path.name[:-len("_log.log")], method, level, since, until, use_index) for path in files]
+    if len(jobs) > 1 and workers != 1:
+        from concurrent.futures import ProcessPoolExecutor  # Тяжелый импорт откладывается до первого поиска
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_search_log_file, *zip(*jobs)))
+    else:
+        chunks = [_search_log_file(*job) for job in jobs]
+    return sorted((entry for chunk in chunks for entry in chunk), key=lambda entry: entry.time)
+
+
+def aggregate_logs(entries, by="method") -> Counter:
+    """Считает записи по полю (user, method, level) или по часу ("hour")."""
+    if by == "hour":
+        return Counter(entry.time[:13] for entry in entries)
+    return Counter(getattr(entry, by) for entry in entries)
+
+
+BatchResult = namedtuple("BatchResult", "line action name ok message")
+BATCH_ACTIONS = ("create", "update", "delete")
+
+
+def load_batch_file(path) -> list:
+    """
+    Читает описания пользователей из CSV (с заголовком) или JSONL.
+    Обязательные поля: action (create/update/delete) и name; role (user/admin) — для create;
+    остальные непустые поля сохраняются в профиль.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            return [{k: v for k, v in row.items() if v not in (None, "")} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# Ротация логов вызовов методов: сегменты по 10 МБ, хранится не больше 10 сжатых сегментов
+LOG_ROTATION = {"max_bytes": 10 * 1024 * 1024, "backup_count": 10}
+
+
+def migrate_profiles(source: TextFileStorage, target) -> int:
+    """Переносит профили из текстовых файлов в другое хранилище. Возвращает число перенесенных профилей."""
+    count = 0
+    for name in source.names():
+        target.replace(name, source.load(name))
+        count += 1
+    logging.info(f"Перенесено профилей: {count}.")
+    return count
+
+
+class AppStorage:
+    """Дескриптор: хранилище профилей текущего контекста приложения (app.storage)."""
+
+    def __get__(self, instance, owner):
+        return app.storage
+
+
+@Logger(rotation=LOG_ROTATION)
+class User:
+    # Хранилище профилей, общее для User, Admin и SuperAdmin
+    storage = AppStorage()
+
+    def __init__(self, name: str, **kwargs) -> None:
+        self.name = name
+        self.user_dir = app.base_dir / "Users"  # Каталог текстовых профилей (для миграции)
+        # Без новых данных существующий профиль берется из кэша, иначе сохраняем и получаем профиль целиком
+        data = self.storage.load(self.name) if not kwargs else {}
+        if not data:
+            data = self.save_user_info(**kwargs)
+        for key, value in data.items():
+            setattr(self, key, value)
+
+    def load(self) -> None:
+        data = self.storage.load(self.name)
+        if data:
+            for key, value in data.items():
+                setattr(self, key, value)
+            logging.info(f"Данные для пользователя {self.name} загружены.")
+        else:
+            logging.warning(f"Профиль пользователя {self.name} не найден. Создается новый.")
+
+    def save_user_info(self, **kwargs) -> dict:
+        data = self.storage.update(self.name, {"name": self.name, **kwargs})
+        logging.info(f"Информация о пользователе {self.name} сохранена.")
+        return data
 
     def read_user_info(self) -> None:
         """Читает и выводит информацию о пользователе."""
-        user_file_path = self._get_user_file_path()
-        if user_file_path.exists():
-            with user_file_path.open("r", encoding="utf-8") as f:
-                print(f"Данные для пользователя {self.name}:")
-                for line in f:
-                    print(line.strip())
+        data = self.storage.load(self.name)
+        if data:
+            print(f"Данные для пользователя {self.name}:")
+            for key, value in data.items():
+                print(f"{key}={value}")
             logging.info(f"Данные для пользователя {self.name} выведены.")
         else:
-            print(f"Файл пользователя {self.name} не найден.")
-            logging.error(f"Файл пользователя {self.name} не найден.")
+            print(f"Профиль пользователя {self.name} не найден.")
+            logging.error(f"Профиль пользователя {self.name} не найден.")
 
     def del_user_info(self, key: str) -> None:
         """
-        Очищает значение по указанному ключу в файле пользователя, записывая пустую строку.
+        Очищает значение по указанному ключу в профиле пользователя, записывая пустую строку.
         """
-        user_file_path = self._get_user_file_path()
-
         if key in vars(self):
             setattr(self, key, "")  # Обновляем значение на пустую строку
 
-            # Чтение и перезапись файла
-            if user_file_path.exists():
-                with user_file_path.open("r", encoding="utf-8") as f:
-                    lines = f.readlines()
-
-                with user_file_path.open("w", encoding="utf-8") as f:
-                    for line in lines:
-                        if line.startswith(f"{key}="):
-                            f.write(f"{key}=\n")  # Очищаем значение
-                        else:
-                            f.write(line)
-
+            if self.storage.exists(self.name):
+                self.storage.update(self.name, {key: ""})  # Очищаем только этот ключ
                 logging.info(
                     f"Значение для ключа {key} пользователя {self.name} очищено."
                 )
             else:
-                print(f"Файл пользователя {self.name} не найден.")
-                logging.error(f"Файл пользователя {self.name} не найден.")
+                print(f"Профиль пользователя {self.name} не найден.")
+                logging.error(f"Профиль пользователя {self.name} не найден.")
         else:
             print(f"Ключ {key} не найден у пользователя {self.name}.")
             logging.warning(f"Ключ {key} не найден у пользователя {self.name}.")
 
     def write_data(self, file_name: str, data: str) -> None:
         """Записывает данные в файл пользователя."""
-        files_dir = Path("files") / "Users" / self.name
-        files_dir.mkdir(
-            parents=True, exist_ok=True
-        )  # Создаем директорию, если не существует
-        file_path = files_dir / file_name
-
-        with file_path.open("a+", encoding="utf-8") as f:
-            f.write(data + "\n")
-            logging.info(f"Данные успешно записаны в {file_name}.")
+        file_path = app.app_dir / "files" / "Users" / self.name / file_name
+        data_writer.write(file_path, data)  # Директория создается при открытии файла
+        logging.info(f"Данные успешно записаны в {file_name}.")
 
     def read_data(self, file_name: str) -> str:
         """Читает данные из файла пользователя."""
-        file_path = Path("files") / "Users" / self.name / file_name
+        file_path = app.app_dir / "files" / "Users" / self.name / file_name
 
-        if file_path.exists():
-            with file_path.open("r", encoding="utf-8") as f:
-                data = f.read()
-                print(f"Данные из файла {file_name}:\n{data}")
-                logging.info(f"Данные из файла {file_name} успешно прочитаны.")
-                return data
+        if file_path.is_file():
+            data = file_cache.get(file_path, read_text)
+            print(f"Данные из файла {file_name}:\n{data}")
+            logging.info(f"Данные из файла {file_name} успешно прочитаны.")
+            return data
         else:
             print(f"Файл {file_name} не найден.")
             logging.error(f"Файл {file_name} не найден.")
             return ""
 
+    def stream_data(self, file_name: str, offset: int = 0, limit: int = None, tail: int = None):
+        """Построчно читает файл пользователя, не загружая его целиком в память."""
+        file_path = app.app_dir / "files" / "Users" / self.name / file_name
+        if not file_path.is_file():
+            print(f"Файл {file_name} не найден.")
+            logging.error(f"Файл {file_name} не найден.")
+            return iter(())
+        return stream_file(file_path, offset, limit, tail)
+
 
-@Logger()
+@Logger(rotation=LOG_ROTATION)
 class Admin(User):
     def __init__(self, name, **kwargs):
         super().__init__(name, **kwargs)
@@ -188,37 +1202,44 @@ class Admin(User):
         user = (
             user or self.name
         )  # Если user не передан, используется текущий пользователь
-        files_dir = Path("files") / "Users" / user
+        files_dir = app.app_dir / "files" / "Users" / user
         file_path = files_dir / file_name
 
         if file_path.exists() and file_path.is_file():
-            with file_path.open("r", encoding="utf-8") as f:
-                data = f.read()
-                print(f"Данные из файла {file_name} пользователя {user}:\n{data}")
-                return data
+            data = file_cache.get(file_path, read_text)
+            print(f"Данные из файла {file_name} пользователя {user}:\n{data}")
+            return data
         else:
             print(f"Файл {file_name} не найден для пользователя {user}.")
             return ""
 
+    def stream_data(self, file_name: str, user: str = None, offset: int = 0, limit: int = None, tail: int = None):
+        """
+        Построчно читает файл указанного пользователя, не загружая его целиком в память.
+        Если user не указан, используется текущий пользователь.
+        """
+        user = user or self.name
+        file_path = app.app_dir / "files" / "Users" / user / file_name
+        if not file_path.is_file():
+            print(f"Файл {file_name} не найден для пользователя {user}.")
+            return iter(())
+        return stream_file(file_path, offset, limit, tail)
+
     def write_data(self, file_name: str, data: str, user: str = None) -> None:
         """
         Записывает данные в файл указанного пользователя. Если user не указан, используется текущий пользователь.
         """
         user = user or self.name
-        files_dir = Path("files") / "Users" / user
-        files_dir.mkdir(parents=True, exist_ok=True)
-        file_path = files_dir / file_name
-
-        with file_path.open("a+", encoding="utf-8") as f:
-            f.write(data + "\n")
-            print(f"Данные успешно записаны в файл {file_name} пользователя {user}")
+        file_path = app.app_dir / "files" / "Users" / user / file_name
+        data_writer.write(file_path, data)
+        print(f"Данные успешно записаны в файл {file_name} пользователя {user}")
 
     def read_logs(self, log_file_name="log.txt", user=None) -> str:
         """
         Читает логи указанного пользователя. Если user не указан, читается лог текущего пользователя.
         """
         user = user or self.name
-        logs_dir = Path("logs")
+        logs_dir = app.app_dir / "logs"
         log_file_path = logs_dir / f"{user}_{log_file_name}"
 
         if log_file_path.exists() and log_file_path.is_file():
@@ -230,6 +1251,16 @@ class Admin(User):
             print(f"Лог-файл {log_file_name} не найден для пользователя {user}.")
             return ""
 
+    def search_logs(self, user=None, method=None, level=None, since=None, until=None) -> list:
+        """
+        Ищет записи в логах вызовов методов. Если user не указан, поиск идет по всем пользователям.
+        """
+        entries = search_logs([user] if user else None, method, level, since, until)
+        for entry in entries:
+            print(f"{entry.time} {entry.user} {entry.level} {entry.message}")
+        print(f"Найдено записей: {len(entries)}")
+        return entries
+
 
 class SuperAdmin(Admin):
     def __init__(self, name, **kwargs):
@@ -244,9 +1275,7 @@ class SuperAdmin(Admin):
             raise ValueError("Invalid role specified.")
 
     def del_user(self, username):
-        user_file_path = Path("files") / "Users" / f"{username}.txt"
-        if user_file_path.exists():
-            os.remove(user_file_path)
+        if self.storage.delete(username):
             print(f"Пользователь {username} удален.")
             logging.info(f"Пользователь {username} удален.")
         else:
@@ -254,13 +1283,9 @@ class SuperAdmin(Admin):
             logging.error(f"Пользователь {username} не найден.")
 
     def change_user_info(self, username, **kwargs):
-        user_file_path = Path("Users") / f"{username}.txt"
-        if user_file_path.exists():
+        if self.storage.exists(username):
             try:
-                with user_file_path.open("w", encoding="utf-8") as f:
-                    f.write(f"name={username}\n")
-                    for k, v in kwargs.items():
-                        f.write(f"{k}={v}\n")
+                self.storage.replace(username, {"name": username, **kwargs})
                 print(f"Информация пользователя {username} успешно изменена.")
                 logging.info(f"Информация пользователя {username} успешно изменена.")
             except Exception as e:
@@ -274,8 +1299,12 @@ class SuperAdmin(Admin):
 
     def rename_file(self, file_path, new_name):
         try:
-            new_file_path = Path(file_path).with_name(new_name)
-            os.rename(file_path, new_file_path)
+            source_path = app.resolve(file_path)
+            new_file_path = source_path.with_name(new_name)
+            data_writer.release(source_path)
+            os.rename(source_path, new_file_path)
+            file_cache.invalidate(source_path)
+            file_cache.invalidate(new_file_path)
             print(f"Файл {file_path} переименован в {new_name}.")
             logging.info(f"Файл {file_path} переименован в {new_name}.")
         except Exception as e:
@@ -284,23 +1313,110 @@ class SuperAdmin(Admin):
 
     def rename_dir(self, dir_path, new_name):
         try:
-            new_dir_path = Path(dir_path).parent / new_name
-            os.rename(dir_path, new_dir_path)
+            source_path = app.resolve(dir_path)
+            new_dir_path = source_path.parent / new_name
+            data_writer.release()
+            os.rename(source_path, new_dir_path)
+            file_cache.invalidate()
             print(f"Директория {dir_path} переименована в {new_name}.")
             logging.info(f"Директория {dir_path} переименована в {new_name}.")
         except Exception as e:
             print("Ошибка при переименовании директории:", e)
             logging.error(f"Ошибка при переименовании директории {dir_path}: {e}")
 
+    def apply_batch(self, records, workers=1, dry_run=False, atomic=False) -> list:
+        """
+        Применяет пакет операций над пользователями и возвращает BatchResult по каждой записи.
+        dry_run=True только проверяет записи; atomic=True применяет пакет целиком или не применяет ничего.
+        В SQLite пакет выполняется одной транзакцией; workers > 1 используется только
+        для хранилищ без транзакций (текстовые профили).
+        """
+        results = [None] * len(records)
+        valid = []
+        seen = set()
+        for line, record in enumerate(records, 1):
+            action, name = record.get("action", ""), str(record.get("name", "")).strip()
+            if action not in BATCH_ACTIONS:
+                error = f"неизвестное действие {action!r}"
+            elif not name or "/" in name or "\\" in name:
+                error = f"недопустимое имя {name!r}"
+            elif name in seen:
+                error = f"пользователь {name} уже встречается в пакете"
+            elif action == "create" and self.storage.exists(name):
+                error = f"пользователь {name} уже существует"
+            elif action != "create" and not self.storage.exists(name):
+                error = f"пользователь {name} не найден"
+            elif action == "create" and str(record.get("role", "user")).lower() not in ("user", "admin"):
+                error = f"неизвестная роль {record.get('role')!r}"
+            else:
+                error = None
+            seen.add(name)
+            if error:
+                results[line - 1] = BatchResult(line, action, name, False, error)
+            else:
+                valid.append((line, action, name, record))
+                results[line - 1] = BatchResult(line, action, name, True, "проверено")
+
+        if dry_run:
+            return results
+        if atomic and len(valid) < len(records):
+            for line, action, name, record in valid:
+                results[line - 1] = BatchResult(line, action, name, False, "не применено: в пакете есть ошибки")
+            return results
+
+        def apply(item):
+            line, action, name, record = item
+            fields = {k: v for k, v in record.items() if k not in ("action", "name", "role")}
+            if action == "create":
+                role = Admin if str(record.get("role", "user")).lower() == "admin" else User
+                self.create_user(name, role=role, **fields)
+            elif action == "update":
+                self.storage.update(name, fields)
+            else:
+                self.storage.delete(name)
+            return BatchResult(line, action, name, True, "выполнено")
+
+        def apply_isolated(item, transaction=contextlib.nullcontext):
+            # Исключение должно выйти из transaction(), иначе точка сохранения не откатится
+            try:
+                with transaction():
+                    return apply(item)
+            except Exception as e:
+                line, action, name, _ = item
+                return BatchResult(line, action, name, False, str(e))
+
+        if hasattr(self.storage, "transaction"):
+            # Весь пакет — одна транзакция SQLite; в обычном режиме каждая запись — точка сохранения,
+            # так что ошибка одной записи откатывает только ее
+            try:
+                with self.storage.transaction():
+                    for item in valid:
+                        if atomic:
+                            results[item[0] - 1] = apply(item)
+                        else:
+                            results[item[0] - 1] = apply_isolated(item, self.storage.transaction)
+            except Exception as e:
+                # Упавшая запись — первая без результата; если таких нет, не удалась сама фиксация
+                failed = next((item for item in valid if results[item[0] - 1].message == "проверено"), None)
+                for line, action, name, record in valid:
+                    message = str(e) if failed is None or line == failed[0] else "отменено"
+                    results[line - 1] = BatchResult(line, action, name, False, message)
+        else:
+            # Хранилище без транзакций: записи независимы, их можно применять в пуле потоков
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(apply_isolated, valid):
+                    results[result.line - 1] = result
+        logging.info(f"Пакет из {len(records)} записей обработан, успешно: {sum(r.ok for r in results)}.")
+        return results
+
     def create_log(self, data, user=None, log_file_name="log.txt"):
         if user is None:
             user = self.name
-        logs_dir = Path("logs")
-        log_file_path = logs_dir / f"{user}_{log_file_name}"
-        logs_dir.mkdir(parents=True, exist_ok=True)
+        log_file_path = app.app_dir / "logs" / f"{user}_{log_file_name}"
         try:
-            with log_file_path.open("a", encoding="utf-8") as f:
-                f.write(f"{data}\n")
+            data_writer.write(log_file_path, f"{data}")
             print(f"Лог записан в {log_file_path}.")
             logging.info(f"Лог записан в {log_file_path}.")
         except Exception as e:
@@ -308,7 +1424,7 @@ class SuperAdmin(Admin):
             logging.error(f"Ошибка при записи в лог-файл {log_file_path}: {e}")
 
     def read_all_logs(self, log_file_name="log.txt"):
-        logs_dir = Path("logs")
+        logs_dir = app.app_dir / "logs"
         log_file_path = logs_dir / log_file_name
         if log_file_path.exists() and log_file_path.is_file():
             try:
@@ -326,7 +1442,204 @@ class SuperAdmin(Admin):
             return ""
 
 
+def benchmark_logging(calls=20000, users=10) -> dict:
+    """Сравнивает скорость логирования через FileHandler и через BatchLogWriter (вызовов в секунду)."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, options in (("file", {}), ("queued", {"queued": True})):
+            pool = LoggerPool()
+            logger = Logger(log_dir=tmp, pool=pool, **options)
+
+            class Bench:
+                def __init__(self, name):
+                    self.name = name
+
+                def action(self, value):
+                    return value
+
+            Bench = logger(Bench)
+            instances = [Bench(f"bench_{mode}_{i}") for i in range(users)]
+            start = time.perf_counter()
+            for i in range(calls):
+                instances[i % users].action(i)
+            logger.flush()
+            results[mode] = calls / (time.perf_counter() - start)
+            pool.close()
+            if logger.writer is not None:
+                logger.writer.close()
+    for mode, rate in results.items():
+        print(f"{mode}: {rate:.0f} вызовов/с")
+    return results
+
+
+def benchmark_log_overhead(calls=100000) -> dict:
+    """Измеряет накладные расходы декоратора Logger на один вызов (мкс) при включенном и выключенном INFO."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = LoggerPool()
+        logger = Logger(log_dir=tmp, max_length=100, pool=pool)
+
+        class Bench:
+            def __init__(self, name):
+                self.name = name
+
+            def action(self, value):
+                return value
+
+        raw_action = Bench.action
+        Bench = logger(Bench)
+        instance = Bench("bench_overhead")
+        user_logger = logger.get_logger(instance)
+        payload = "x" * 10000
+
+        start = time.perf_counter()
+        for _ in range(calls):
+            raw_action(instance, payload)
+        baseline = time.perf_counter() - start
+
+        for mode, level in (("on", logging.INFO), ("off", logging.WARNING)):
+            user_logger.setLevel(level)
+            start = time.perf_counter()
+            for _ in range(calls):
+                instance.action(payload)
+            results[mode] = (time.perf_counter() - start - baseline) / calls * 1e6
+        pool.close()
+    for mode, overhead in results.items():
+        print(f"логирование {mode}: {overhead:.2f} мкс/вызов")
+    return results
+
+
+def benchmark_writer(lines=100000, files=10) -> dict:
+    """Сравнивает скорость записи строк (строк в секунду): open/write/close на каждую строку и AppendWriter."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / "legacy" / f"data_{i}.txt" for i in range(files)]
+        start = time.perf_counter()
+        for i in range(lines):
+            file_path = paths[i % files]
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with file_path.open("a+", encoding="utf-8") as f:
+                f.write(f"line {i}\n")
+        results["legacy"] = lines / (time.perf_counter() - start)
+
+        for durability in ("none", "batch"):
+            paths = [Path(tmp) / durability / f"data_{i}.txt" for i in range(files)]
+            writer = AppendWriter(durability=durability)
+            start = time.perf_counter()
+            with writer:
+                for i in range(lines):
+                    writer.write(paths[i % files], f"line {i}")
+            writer.close()
+            results[f"group_commit_{durability}"] = lines / (time.perf_counter() - start)
+    for mode, rate in results.items():
+        print(f"{mode}: {rate:.0f} строк/с")
+    return results
+
+
+def benchmark_logger_fds(users=100000, max_open=256) -> dict:
+    """Логирует вызовы от users разных пользователей и проверяет, что число открытых дескрипторов не растет."""
+    fd_dir = "/proc/self/fd"
+    results = {"max_fds": 0}
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = LoggerPool(max_open=max_open)
+        logger = Logger(log_dir=tmp, pool=pool)
+
+        class Bench:
+            def __init__(self, name):
+                self.name = name
+
+            def action(self):
+                return None
+
+        Bench = logger(Bench)
+        start_fds = len(os.listdir(fd_dir)) if os.path.isdir(fd_dir) else 0
+        start = time.perf_counter()
+        for i in range(users):
+            Bench(f"user_{i}").action()
+            if i % 1000 == 0 and start_fds:
+                results["max_fds"] = max(results["max_fds"], len(os.listdir(fd_dir)) - start_fds)
+        results["users_per_second"] = users / (time.perf_counter() - start)
+        results["pool_size"] = len(pool)
+        results["registered_loggers"] = len(logging.Logger.manager.loggerDict)
+        pool.close()
+    print(f"пользователей: {users}, макс. открытых дескрипторов: {results['max_fds']}, "
+          f"логгеров в пуле: {results['pool_size']}, в реестре logging: {results['registered_loggers']}, "
+          f"{results['users_per_second']:.0f} пользователей/с")
+    return results
+
+
+def benchmark_batch(records=2000) -> dict:
+    """Измеряет скорость пакетного создания пользователей (записей в секунду) в обычном и атомарном режиме."""
+    results = {}
+    saved_base_dir = app.base_dir
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            for mode in ("по записи", "atomic"):
+                app.configure(Path(tmp) / str(len(results)))
+                admin = SuperAdmin("bench_admin")
+                batch = [{"action": "create", "name": f"user_{i}", "role": "user", "city": "Москва"}
+                         for i in range(records)]
+                start = time.perf_counter()
+                admin.apply_batch(batch, atomic=mode == "atomic")
+                results[mode] = records / (time.perf_counter() - start)
+                app.storage.storage.close()
+                logger_pool.close()
+        finally:
+            app.configure(saved_base_dir)
+    for mode, rate in results.items():
+        print(f"{mode}: {rate:.0f} записей/с")
+    return results
+
+
+def batch_main(argv) -> int:
+    """Командная строка пакетных операций: python tx1.py batch users.csv [--dry-run] [--atomic]."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="tx1.py batch", description="Пакетное управление пользователями")
+    parser.add_argument("file", help="CSV или JSONL файл с полями action, name, role и данными профиля")
+    parser.add_argument("--admin", default="superadmin", help="имя супер админа, от которого выполняется пакет")
+    parser.add_argument("--workers", type=int, default=1, help="число потоков (только для хранилищ без транзакций)")
+    parser.add_argument("--dry-run", action="store_true", help="только проверить записи")
+    parser.add_argument("--atomic", action="store_true", help="применить все записи или ни одной")
+    args = parser.parse_args(argv)
+
+    admin = SuperAdmin(args.admin)
+    results = admin.apply_batch(load_batch_file(args.file), args.workers, args.dry_run, args.atomic)
+    for result in results:
+        status = "OK" if result.ok else "ОШИБКА"
+        print(f"{result.line}: {result.action} {result.name} — {status}: {result.message}")
+    failed = sum(not result.ok for result in results)
+    print(f"Всего: {len(results)}, ошибок: {failed}")
+    return 1 if failed else 0
+
+
+def benchmark_import(runs=5) -> float:
+    """Измеряет время импорта модуля (мс, медиана) по данным python -X importtime в отдельном процессе."""
+    import subprocess
+
+    module = Path(__file__).stem
+    # Байткод должен кэшироваться, иначе измеряется компиляция исходника; первый запуск прогревает кэш
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    timings = []
+    for run in range(runs + 1):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, env=env,
+        )
+        if run == 0:
+            continue
+        for line in completed.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                timings.append(int(parts[1]) / 1000)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"импорт {module}: {median:.1f} мс")
+    return median
+
+
 def main():
+    print("Директория приложения:", app.app_dir)
     while True:
         try:
             print("Добро пожаловать! Выберите права доступа:")
@@ -392,7 +1705,7 @@ def user_menu(user):
             user.write_data(file_name, data)
         elif choice == "5":
             file_name = input("Введите имя файла: ")
-            user.read_data(file_name)
+            page_lines(user.stream_data(file_name))
         elif choice == "6":
             print("Выход из меню пользователя.")
             break
@@ -407,7 +1720,8 @@ def admin_menu(user):
         print("2. Прочитать данные пользователя")
         print("3. Записать данные пользователя")
         print("4. Прочитать логи")
-        print("5. Выйти")
+        print("5. Поиск по логам")
+        print("6. Выйти")
 
         choice = input("Выберите действие: ")
 
@@ -416,7 +1730,7 @@ def admin_menu(user):
         elif choice == "2":
             username = input("Введите имя пользователя: ")
             file_name = input("Введите имя файла: ")
-            user.read_data(file_name, username)
+            page_lines(user.stream_data(file_name, username))
         elif choice == "3":
             username = input("Введите имя пользователя: ")
             file_name = input("Введите имя файла: ")
@@ -425,6 +1739,11 @@ def admin_menu(user):
         elif choice == "4":
             user.read_logs()
         elif choice == "5":
+            username = input("Введите имя пользователя (пусто — все): ").strip()
+            method = input("Введите имя метода (пусто — все): ").strip()
+            since = input("С какого времени (ГГГГ-ММ-ДД чч:мм:сс, пусто — с начала): ").strip()
+            user.search_logs(username or None, method or None, since=since or None)
+        elif choice == "6":
             print("Выход из меню админа.")
             break
         else:
@@ -481,4 +1800,23 @@ def superadmin_menu(user):
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["migrate"]:
+        # python tx1.py migrate — перенос профилей Users/*.txt в users.db
+        count = migrate_profiles(TextFileStorage(app.base_dir / "Users"), User.storage)
+        print(f"Перенесено профилей: {count}")
+    elif sys.argv[1:2] == ["bench-logging"]:
+        benchmark_logging()
+    elif sys.argv[1:2] == ["bench-overhead"]:
+        benchmark_log_overhead()
+    elif sys.argv[1:2] == ["bench-writer"]:
+        benchmark_writer()
+    elif sys.argv[1:2] == ["bench-fd"]:
+        benchmark_logger_fds()
+    elif sys.argv[1:2] == ["batch"]:
+        sys.exit(batch_main(sys.argv[2:]))
+    elif sys.argv[1:2] == ["bench-batch"]:
+        benchmark_batch()
+    elif sys.argv[1:2] == ["bench-import"]:
+        benchmark_import()
+    else:
+        main()
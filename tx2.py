@@ -1,56 +1,121 @@
+import gc
+import sys
+import math
+import time
+import random
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy колонки проверяются обычным проходом
+    np = None
+
+
 class EmployeeManager:
+    """
+    Дескриптор поля сотрудника. Проверка и ее границы выбираются один раз в __set_name__
+    по имени поля, так что присваивание — это один вызов готовой функции и запись в __dict__.
+    """
+
+    # Имя поля -> метод, собирающий для него функцию проверки
+    checks = {"employee_name": "compile_name", "age": "compile_age", "salary": "compile_salary"}
+    # id(сотрудника) -> слабые ссылки на коллекции, в индексах которых он лежит. Членство
+    # хранится здесь, а не в __dict__ объекта, чтобы copy.copy(сотрудник) не считался проиндексированным
+    watchers = {}
+
     def __init__(self, **kwargs) -> None:
         self.kwargs = kwargs
 
     def __set_name__(self, owner, name):
+        self.field = name
         self.name = "_" + name
+        self.bounds = None  # (нижняя, верхняя) граница; для имени — границы длины
+        compile_check = self.checks.get(name)
+        self.check = getattr(self, compile_check)() if compile_check else self.missing
 
-    def validate_name(self, value, **kwargs):
+    def missing(self, value):
+        raise AttributeError(f"Нет атрибута '{self.name}'")
+
+    def compile_name(self):
         min_len = self.kwargs.get("min_len")
         max_len = self.kwargs.get("max_len")
-        if not isinstance(value, str):
-            raise ValueError("Имя должно быть строкой")
-        if self.kwargs:
-            if not min_len < len(value) < max_len:
+        bounded = bool(self.kwargs)
+        self.bounds = (min_len, max_len) if bounded else None
+
+        def check(value):
+            if not isinstance(value, str):
+                raise ValueError("Имя должно быть строкой")
+            if bounded and not min_len < len(value) < max_len:
                 raise ValueError(f"имя должно быть в диапазоне ({min_len})-({max_len})")
 
-    def validate_age(self, value, **kwargs):
+        return check
+
+    def compile_age(self):
         max_age = self.kwargs.get("max_age")
         min_age = self.kwargs.get("min_age")
-        if not isinstance(value, int):
-            raise ValueError("Возраст должен быть числом")
-        if kwargs:
-            if not min_age <= value <= max_age:
+        bounded = bool(self.kwargs)
+        self.bounds = (min_age, max_age) if bounded else None
+
+        def check(value):
+            if not isinstance(value, int):
+                raise ValueError("Возраст должен быть числом")
+            if bounded and not min_age <= value <= max_age:
                 raise ValueError(
                     f"возраст должен быть в диапазоне ({min_age}-{max_age})"
                 )
 
-    def validate_salary(self, value, **kwargs):
+        return check
+
+    def compile_salary(self):
         min_salary = self.kwargs.get("min_salary")
         max_salary = self.kwargs.get("max_salary")
-        if not isinstance(value, (int, float)):
-            raise ValueError("Зарплата должна быть числом")
-        if kwargs:
-            if not min_salary <= value <= max_salary:
+        bounded = bool(self.kwargs)
+        self.bounds = (min_salary, max_salary) if bounded else None
+
+        def check(value):
+            if not isinstance(value, (int, float)):
+                raise ValueError("Зарплата должна быть числом")
+            if bounded and not min_salary <= value <= max_salary:
                 raise ValueError(
                     f"зарплата должна быть в диапазоне ({min_salary}-{max_salary})"
                 )
 
+        return check
+
+    def validate_name(self, value, **kwargs):
+        self.compile_name()(value)
+
+    def validate_age(self, value, **kwargs):
+        self.compile_age()(value)
+
+    def validate_salary(self, value, **kwargs):
+        self.compile_salary()(value)
+
     def __set__(self, instance, value):
-        if self.name == "_employee_name":
-            self.validate_name(value, **self.kwargs)
-        elif self.name == "_age":
-            self.validate_age(value, **self.kwargs)
-        elif self.name == "_salary":
-            self.validate_salary(value, **self.kwargs)
+        self.check(value)
+        fields = instance.__dict__
+        watchers = self.watchers.get(id(instance)) if self.watchers else None
+        if watchers:
+            # Объект входит в EmployeeCollection — индексы и итоги обновляются после записи
+            old = fields.get(self.name)
+            fields[self.name] = value
+            for ref in watchers:
+                watcher = ref()
+                if watcher is not None:
+                    watcher.changed(instance, self.field, old, value)
         else:
-            raise AttributeError(f"Нет атрибута '{self.name}'")
-        setattr(instance, self.name, value)
+            fields[self.name] = value
 
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return getattr(instance, self.name)
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(f"'{type(instance).__name__}' object has no attribute '{self.name}'") from None
 
 
 class Employee:
@@ -69,8 +134,518 @@ class Manager(Employee):
         super().__init__(employee_name, age, salary)
 
 
-employee = Employee(employee_name="John Doe", age=25, salary=3000)
-manager = Manager(employee_name="Alice", age=30, salary=5000)
+class ColumnField:
+    """Поле строки EmployeeTable: читает и пишет ячейку колонки, проверяя значение дескриптором Employee."""
+
+    def __init__(self, manager, column):
+        self.manager = manager
+        self.column = column
+
+    def __set__(self, instance, value):
+        self.manager.check(value)
+        instance._table.set(self.column, instance._index, value)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return getattr(instance._table, self.column)[instance._index]
+
+
+class EmployeeTable:
+    """
+    Таблица сотрудников по колонкам: имена (интернированные строки), возраст (array 'q'),
+    зарплата (array 'd') и класс строки. load() загружает строки без проверки по одной,
+    validate() проверяет колонки целиком по границам дескрипторов Employee и возвращает
+    номера плохих строк. table[i] — строка как объект Employee/Manager, который читает
+    и пишет прямо в колонки.
+    """
+
+    fields = (("employee_name", "names"), ("age", "ages"), ("salary", "salaries"))
+
+    def __init__(self, classes=(Employee, Manager)):
+        self.classes = list(classes)
+        self.names = []
+        self.ages = array("q")
+        self.salaries = array("d")
+        self.kinds = array("B")
+        self.type_errors = {"employee_name": [], "age": [], "salary": []}
+        self._row_classes = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Нет строки с таким номером")
+        return self._row_class(self.classes[self.kinds[index]])(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _row_class(self, cls):
+        row_class = self._row_classes.get(cls)
+        if row_class is None:
+            def __init__(row, table, index):
+                row._table = table
+                row._index = index
+
+            namespace = {"__init__": __init__}
+            for field, column in self.fields:
+                namespace[field] = ColumnField(getattr(cls, field), column)
+            row_class = self._row_classes[cls] = type(f"{cls.__name__}Row", (cls,), namespace)
+        return row_class
+
+    def set(self, column, index, value):
+        getattr(self, column)[index] = sys.intern(value) if column == "names" else value
+
+    def append(self, employee_name, age, salary, cls=Employee):
+        """Добавляет одну строку с обычной проверкой дескрипторами."""
+        cls.employee_name.check(employee_name)
+        cls.age.check(age)
+        cls.salary.check(salary)
+        self.names.append(sys.intern(employee_name))
+        self.ages.append(age)
+        self.salaries.append(salary)
+        self.kinds.append(self.classes.index(cls))
+
+    def load(self, rows, cls=Employee):
+        """
+        Загружает строки (имя, возраст, зарплата) пакетом. Значения неверного типа
+        заменяются нулями, а номера их строк попадают в type_errors и в результат validate().
+        """
+        start = len(self)
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return 0
+        names, ages, salaries = (list(map(itemgetter(i), rows)) for i in range(3))
+        if set(map(type, names)) == {str}:
+            self.names.extend(map(sys.intern, names))
+        else:
+            self.names.extend(sys.intern(name) if isinstance(name, str) else name for name in names)
+            self.type_errors["employee_name"].extend(
+                start + i for i, name in enumerate(names) if not isinstance(name, str))
+        self._extend(self.ages, ages, int, "age", start)
+        self._extend(self.salaries, salaries, (int, float), "salary", start)
+        self.kinds.extend(array("B", [self.classes.index(cls)]) * len(rows))
+        return len(rows)
+
+    def _extend(self, column, values, types, field, start):
+        try:
+            column.extend(array(column.typecode, values))
+        except (TypeError, OverflowError):
+            # Есть значения неверного типа — разбираем колонку поштучно
+            bad = self.type_errors[field]
+            for i, value in enumerate(values):
+                try:
+                    if not isinstance(value, types):
+                        raise TypeError(value)
+                    column.append(value)
+                except (TypeError, OverflowError):
+                    column.append(0)
+                    bad.append(start + i)
+
+    def _out_of_range(self, values, bounds):
+        low, high = bounds
+        if not values:
+            return []
+        if np is not None:
+            column = np.frombuffer(values, dtype=np.int64 if values.typecode == "q" else np.float64)
+            # Условие записано через попадание в диапазон, чтобы NaN считался нарушением, как в дескрипторе
+            return np.flatnonzero(~((column >= low) & (column <= high))).tolist()
+        has_nan = values.typecode == "d" and math.isnan(sum(values))  # NaN не виден min() и max()
+        if not has_nan and low <= min(values) and max(values) <= high:
+            return []  # min/max проходят колонку на скорости C; поштучно — только если есть нарушения
+        return [i for i, value in enumerate(values) if not low <= value <= high]
+
+    def validate(self):
+        """Проверяет колонки целиком. Возвращает {поле: номера плохих строк по возрастанию}; пустой словарь — все в порядке."""
+        errors = {}
+        kinds = set(self.kinds)
+        for kind in kinds:
+            cls = self.classes[kind]
+            rows = None if len(kinds) == 1 else {i for i, k in enumerate(self.kinds) if k == kind}
+            for field, column in self.fields:
+                bounds = getattr(cls, field).bounds
+                bad = set(self.type_errors[field])
+                if bounds is not None:
+                    if field == "employee_name":
+                        low, high = bounds
+                        # Для имени границы строгие, как в дескрипторе
+                        if self.type_errors["employee_name"]:
+                            lengths = array("q", [len(name) if isinstance(name, str) else low + 1
+                                                  for name in self.names])
+                        else:
+                            lengths = array("q", map(len, self.names))
+                        bad.update(self._out_of_range(lengths, (low + 1, high - 1)))
+                    else:
+                        bad.update(self._out_of_range(getattr(self, column), bounds))
+                if rows is not None:
+                    bad &= rows
+                if bad:
+                    errors.setdefault(field, set()).update(bad)
+        return {field: sorted(bad) for field, bad in errors.items()}
+
+
+class SortedIndex:
+    """
+    Отсортированный индекс по полю: ключи и объекты лежат блоками по ~load штук, над блоками —
+    список максимумов. Поиск диапазона — bisect по максимумам и внутри блока, вставка и удаление
+    сдвигают только один блок, а не весь список.
+    """
+
+    load = 1000
+
+    def __init__(self, field):
+        self.field = field
+        self.attr = "_" + field  # значение читается из __dict__ в обход дескриптора
+        self._keys = []
+        self._items = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for items in self._items:
+            yield from items
+
+    def add(self, item, key):
+        self._len += 1
+        if not self._maxes:
+            self._keys.append([key])
+            self._items.append([item])
+            self._maxes.append(key)
+            return
+        b = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys, items = self._keys[b], self._items[b]
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        items.insert(i, item)
+        self._maxes[b] = keys[-1]
+        if len(keys) > 2 * self.load:
+            self._keys[b:b + 1] = [keys[:self.load], keys[self.load:]]
+            self._items[b:b + 1] = [items[:self.load], items[self.load:]]
+            self._maxes[b:b + 1] = [keys[self.load - 1], keys[-1]]
+
+    def extend(self, items):
+        """Пакетная вставка: одна сортировка и нарезка на блоки вместо вставки по одному."""
+        attr = self.attr
+        pairs = [(item.__dict__[attr], item) for item in items]
+        pairs.extend(zip(self._keys_flat(), self))
+        pairs.sort(key=itemgetter(0))
+        keys = [key for key, _ in pairs]
+        objects = [item for _, item in pairs]
+        step = self.load
+        self._keys = [keys[i:i + step] for i in range(0, len(keys), step)]
+        self._items = [objects[i:i + step] for i in range(0, len(objects), step)]
+        self._maxes = [block[-1] for block in self._keys]
+        self._len = len(keys)
+
+    def _keys_flat(self):
+        for keys in self._keys:
+            yield from keys
+
+    def remove(self, item, key):
+        # Равные ключи могут переходить в следующие блоки
+        for b in range(bisect_left(self._maxes, key), len(self._maxes)):
+            keys, items = self._keys[b], self._items[b]
+            for i in range(bisect_left(keys, key), len(keys)):
+                if keys[i] != key:
+                    raise KeyError(key)
+                if items[i] is item:
+                    del keys[i]
+                    del items[i]
+                    self._len -= 1
+                    if keys:
+                        self._maxes[b] = keys[-1]
+                    else:
+                        del self._keys[b], self._items[b], self._maxes[b]
+                    return
+        raise KeyError(key)
+
+    def range(self, low=None, high=None):
+        """Срезы блоков с low <= ключ <= high; None — без ограничения."""
+        slices = []
+        start = 0 if low is None else bisect_left(self._maxes, low)
+        for b in range(start, len(self._maxes)):
+            keys = self._keys[b]
+            if high is not None and keys[0] > high:
+                break
+            lo = 0 if low is None else bisect_left(keys, low)
+            hi = len(keys) if high is None else bisect_right(keys, high)
+            if lo < hi:
+                slices.append((b, lo, hi))
+        return slices
+
+    def count(self, low=None, high=None):
+        return sum(hi - lo for _, lo, hi in self.range(low, high))
+
+    def select(self, low=None, high=None):
+        result = []
+        for b, lo, hi in self.range(low, high):
+            result.extend(self._items[b][lo:hi])
+        return result
+
+
+class EmployeeCollection:
+    """
+    Коллекция сотрудников с индексами: отсортированные по age и salary, хеш по employee_name
+    и итоги по роли (классу). Коллекция подписывается на объект через EmployeeManager.watchers,
+    поэтому присваивания полей через дескрипторы сразу обновляют индексы и итоги.
+    """
+
+    def __init__(self, employees=()):
+        self.ages = SortedIndex("age")
+        self.salaries = SortedIndex("salary")
+        self.names = {}
+        self.roles = {}  # класс -> [число, сумма зарплат, сумма возрастов]
+        self._ref = weakref.ref(self, _forget_collection)
+        self.extend(employees)
+
+    def __len__(self):
+        return len(self.ages)
+
+    def __iter__(self):
+        return iter(self.ages)
+
+    def __contains__(self, employee):
+        return self._ref in EmployeeManager.watchers.get(id(employee), ())
+
+    def _watch(self, employee):
+        watchers = EmployeeManager.watchers.setdefault(id(employee), [])
+        if self._ref in watchers:
+            raise ValueError("Сотрудник уже есть в коллекции")
+        watchers.append(self._ref)
+        self.names.setdefault(employee.employee_name, []).append(employee)
+        totals = self.roles.setdefault(type(employee), [0, 0, 0])
+        totals[0] += 1
+        totals[1] += employee.salary
+        totals[2] += employee.age
+
+    def add(self, employee):
+        self._watch(employee)
+        self.ages.add(employee, employee.age)
+        self.salaries.add(employee, employee.salary)
+
+    def extend(self, employees):
+        employees = list(employees)
+        registry, ref = EmployeeManager.watchers, self._ref
+        if len({id(employee) for employee in employees}) != len(employees) or \
+                (len(self) and any(ref in registry.get(id(e), ()) for e in employees)):
+            raise ValueError("Сотрудник уже есть в коллекции")
+        # Сборщик мусора на миллионе новых списков подписчиков тратит больше времени, чем сама вставка
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            names, roles = self.names, self.roles
+            for employee in employees:
+                fields = employee.__dict__
+                watchers = registry.get(id(employee))
+                if watchers is None:
+                    registry[id(employee)] = [ref]
+                else:
+                    watchers.append(ref)
+                same_name = names.get(fields["_employee_name"])
+                if same_name is None:
+                    names[fields["_employee_name"]] = [employee]
+                else:
+                    same_name.append(employee)
+                totals = roles.get(type(employee))
+                if totals is None:
+                    totals = roles[type(employee)] = [0, 0, 0]
+                totals[0] += 1
+                totals[1] += fields["_salary"]
+                totals[2] += fields["_age"]
+            if employees:
+                self.ages.extend(employees)
+                self.salaries.extend(employees)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def remove(self, employee):
+        watchers = EmployeeManager.watchers.get(id(employee), [])
+        if self._ref not in watchers:
+            raise ValueError("Сотрудника нет в коллекции")
+        watchers.remove(self._ref)
+        if not watchers:
+            # id освобождается вместе с объектом — запись нельзя оставлять для нового владельца id
+            del EmployeeManager.watchers[id(employee)]
+        self.ages.remove(employee, employee.age)
+        self.salaries.remove(employee, employee.salary)
+        same_name = self.names[employee.employee_name]
+        same_name.remove(employee)
+        if not same_name:
+            del self.names[employee.employee_name]
+        totals = self.roles[type(employee)]
+        totals[0] -= 1
+        totals[1] -= employee.salary
+        totals[2] -= employee.age
+
+    def changed(self, employee, field, old, new):
+        """Вызывается дескриптором EmployeeManager после изменения поля."""
+        totals = self.roles[type(employee)]
+        if field == "age":
+            self.ages.remove(employee, old)
+            self.ages.add(employee, new)
+            totals[2] += new - old
+        elif field == "salary":
+            self.salaries.remove(employee, old)
+            self.salaries.add(employee, new)
+            totals[1] += new - old
+        elif field == "employee_name":
+            same_name = self.names[old]
+            same_name.remove(employee)
+            if not same_name:
+                del self.names[old]
+            self.names.setdefault(new, []).append(employee)
+
+    def query(self, age=None, salary=None, employee_name=None, role=None):
+        """
+        Сотрудники, подходящие под все условия: age и salary — пары (от, до) включительно,
+        None вместо границы — без ограничения; role — класс (подклассы тоже подходят).
+        """
+        if employee_name is not None:
+            candidates = list(self.names.get(employee_name, ()))
+        else:
+            # Берем самый узкий из диапазонов по индексам, остальное проверяем по кандидатам
+            ranges = [(index.count(*limits), index, limits) for index, limits in
+                      ((self.ages, age), (self.salaries, salary)) if limits is not None]
+            if ranges:
+                _, index, limits = min(ranges, key=itemgetter(0))
+                candidates = index.select(*limits)
+                if index is self.ages:
+                    age = None
+                else:
+                    salary = None
+            else:
+                candidates = list(self.ages)
+        if age is not None:
+            candidates = _filter(candidates, "_age", age)
+        if salary is not None:
+            candidates = _filter(candidates, "_salary", salary)
+        if role is not None:
+            candidates = [employee for employee in candidates if isinstance(employee, role)]
+        return candidates
+
+    def totals(self):
+        """Итоги по ролям: {имя класса: {"count", "salary_total", "salary_avg", "age_avg"}}."""
+        return {cls.__name__: {"count": count, "salary_total": salary, "salary_avg": salary / count,
+                               "age_avg": age / count}
+                for cls, (count, salary, age) in self.roles.items() if count}
+
+
+def _forget_collection(ref):
+    """Убирает удаленную коллекцию из EmployeeManager.watchers."""
+    registry = EmployeeManager.watchers
+    for key, watchers in list(registry.items()):
+        if ref in watchers:
+            watchers.remove(ref)
+            if not watchers:
+                del registry[key]
+
+
+def _filter(employees, attr, limits):
+    """Оставляет сотрудников с low <= значение <= high; значения читаются из __dict__ в обход дескриптора."""
+    low, high = limits
+    if low is None:
+        return [e for e in employees if e.__dict__[attr] <= high]
+    if high is None:
+        return [e for e in employees if low <= e.__dict__[attr]]
+    return [e for e in employees if low <= e.__dict__[attr] <= high]
+
+
+def benchmark_construction(records=300000):
+    """Измеряет скорость создания Employee(...) (записей в секунду)."""
+    start = time.perf_counter()
+    for _ in range(records):
+        Employee("John Doe", 25, 3000)
+    rate = records / (time.perf_counter() - start)
+    print(f"Employee(...): {rate:.0f} records/s")
+    return rate
+
+
+def benchmark_table(records=1000000):
+    """Сравнивает загрузку и проверку records строк в EmployeeTable с созданием объектов Employee."""
+    rows = [(f"Employee {i % 1000}", 18 + i % 83, 1000 + i % 90000) for i in range(records)]
+    start = time.perf_counter()
+    for row in rows:
+        Employee(*row)
+    objects = records / (time.perf_counter() - start)
+
+    table = EmployeeTable()
+    start = time.perf_counter()
+    table.load(rows)
+    errors = table.validate()
+    columns = records / (time.perf_counter() - start)
+    print(f"Employee(...): {objects:.0f} rows/s")
+    print(f"EmployeeTable.load + validate: {columns:.0f} rows/s ({'numpy' if np else 'array'}), errors: {errors}")
+    return objects, columns
+
+
+def benchmark_collection(records=1000000, queries=100):
+    """Сравнивает запросы и итоги EmployeeCollection с проходом по списку на records сотрудниках."""
+    rng = random.Random(1)
+    employees = [(Manager if i % 10 == 0 else Employee)(f"Employee {i}", rng.randint(18, 100),
+                                                        rng.randint(1000, 99999)) for i in range(records)]
+    start = time.perf_counter()
+    collection = EmployeeCollection(employees)
+    print(f"build: {time.perf_counter() - start:.2f} s")
+
+    ranges = [(rng.randint(18, 90), rng.randint(1000, 99000)) for _ in range(queries)]
+    start = time.perf_counter()
+    for low_age, low_salary in ranges:
+        [e for e in employees if low_age <= e.age <= low_age + 10 and e.salary >= low_salary]
+    scan = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for low_age, low_salary in ranges:
+        collection.query(age=(low_age, low_age + 10), salary=(low_salary, None))
+    indexed = (time.perf_counter() - start) / queries
+    print(f"range query (age 10 years, salary from X): scan {scan * 1000:.1f} ms, index {indexed * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    for low_age, low_salary in ranges:
+        [e for e in employees if e.salary <= low_salary + 500 and low_salary <= e.salary and e.age >= low_age]
+    scan = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    for low_age, low_salary in ranges:
+        collection.query(age=(low_age, None), salary=(low_salary, low_salary + 500))
+    indexed = (time.perf_counter() - start) / queries
+    print(f"range query (salary X..X+500): scan {scan * 1000:.1f} ms, index {indexed * 1000:.2f} ms")
+
+    start = time.perf_counter()
+    totals = {}
+    for e in employees:
+        role = totals.setdefault(type(e).__name__, [0, 0])
+        role[0] += 1
+        role[1] += e.salary
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    collection.totals()
+    indexed = time.perf_counter() - start
+    print(f"totals by role: scan {scan * 1000:.1f} ms, incremental {indexed * 1000:.3f} ms")
+
+    start = time.perf_counter()
+    for employee in employees[:10000]:
+        employee.salary = rng.randint(1000, 99999)
+    print(f"indexed update: {10000 / (time.perf_counter() - start):.0f} updates/s")
+    return collection
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        benchmark_construction()
+    elif sys.argv[1:2] == ["bench-table"]:
+        benchmark_table()
+    elif sys.argv[1:2] == ["bench-collection"]:
+        benchmark_collection()
+    else:
+        employee = Employee(employee_name="John Doe", age=25, salary=3000)
+        manager = Manager(employee_name="Alice", age=30, salary=5000)
 
-print(employee.employee_name, employee.age, employee.salary)
-print(manager.employee_name, manager.age, manager.salary)
+        print(employee.employee_name, employee.age, employee.salary)
+        print(manager.employee_name, manager.age, manager.salary)
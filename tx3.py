@@ -1,3 +1,17 @@
+import gc
+import os
+import sys
+import time
+from array import array
+from itertools import repeat
+from operator import add, mul, sub
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy пакет считается обычными циклами по array
+    np = None
+
+
 class Operation:
     def __init__(self, a, b):
         self.a = a
@@ -21,6 +35,10 @@ class Operation:
             return Multiplication(self.a * other.a, self.b * other.b)
         return NotImplemented
 
+    def lazy(self, graph=None):
+        """Лист ленивого выражения: операторы над ним строят граф, вычисление — по calculate()."""
+        return (graph if graph is not None else ExpressionGraph()).leaf(self)
+
     def __repr__(self):
         return f"Operation(a={self.a}, b={self.b})"
 
@@ -55,12 +73,682 @@ class Multiplication(Operation):
         return result
 
 
-# Пример использования
-op1 = Addition(5, 10)
-op2 = Subtraction(20, 5)
-op3 = Multiplication(4, 6)
+class Expression:
+    """
+    Узел ленивого выражения над Operation. Лист хранит пару (a, b) операции, внутренний узел — оператор
+    и два операнда; kind — класс операции, который получился бы при обычном вычислении.
+    Пара узла вычисляется один раз и запоминается (value), calculate() — тоже (result).
+    """
+
+    __slots__ = ("graph", "kind", "opcode", "left", "right", "value", "result", "unit")
+
+    def __init__(self, graph, kind, opcode=None, left=None, right=None, value=None):
+        self.graph = graph
+        self.kind = kind
+        self.opcode = opcode
+        self.left = left
+        self.right = right
+        self.value = value
+        self.result = None
+        self.unit = _unit(value)
+
+    def __add__(self, other):
+        return self.graph.node("+", self, other)
+
+    def __sub__(self, other):
+        return self.graph.node("-", self, other)
+
+    def __mul__(self, other):
+        return self.graph.node("*", self, other)
+
+    def __radd__(self, other):
+        return self.graph.node("+", other, self)
+
+    def __rsub__(self, other):
+        return self.graph.node("-", other, self)
+
+    def __rmul__(self, other):
+        return self.graph.node("*", other, self)
+
+    def evaluate(self):
+        """Пара (a, b) узла. Обход графа идет по явному стеку, поэтому глубина цепочки не ограничена стеком вызовов."""
+        if self.value is not None:
+            return self.value
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if node.value is not None:
+                stack.pop()
+                continue
+            left, right = node.left, node.right
+            if left.value is None or (right is not None and right.value is None):
+                stack.append(left)
+                if right is not None:
+                    stack.append(right)
+                continue
+            stack.pop()
+            (a1, b1) = left.value
+            if node.opcode == "=":
+                node.value = left.value
+            elif node.opcode == "+":
+                node.value = (a1 + right.value[0], b1 + right.value[1])
+            elif node.opcode == "-":
+                node.value = (a1 - right.value[0], b1 - right.value[1])
+            else:
+                node.value = (a1 * right.value[0], b1 * right.value[1])
+        return self.value
+
+    def operation(self):
+        """Результат как обычный объект Operation (Addition, Subtraction или Multiplication)."""
+        return self.kind(*self.evaluate())
+
+    def calculate(self):
+        if self.result is None:
+            self.result = self.operation().calculate()
+        return self.result
+
+    def __repr__(self):
+        if self.value is None:
+            return f"Expression({self.kind.__name__}, не вычислено)"
+        return f"Expression({self.kind.__name__}, a={self.value[0]}, b={self.value[1]})"
+
+
+class ExpressionGraph:
+    """
+    Построитель ленивых выражений. Одинаковые листья и узлы с теми же оператором и операндами
+    создаются один раз (устранение общих подвыражений), а сложение и вычитание нулевой
+    пары и умножение на единичную сворачиваются еще при построении, если другой операнд уже
+    известен и результат от свертки не изменится.
+    """
+
+    kinds = {"+": Addition, "-": Subtraction, "*": Multiplication}
+
+    def __init__(self):
+        self._leaves = {}
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._leaves) + len(self._nodes)
+
+    def leaf(self, operation):
+        if isinstance(operation, Expression):
+            return operation
+        value = (operation.a, operation.b)
+        if 0.0 in value and float in map(type, value):
+            # 0.0 и -0.0 равны как ключ, но дают разные результаты — такие листья не переиспользуются
+            return Expression(self, type(operation), value=value)
+        key = (type(operation), type(operation.a), type(operation.b), value)
+        try:
+            node = self._leaves.get(key)
+        except TypeError:  # Нехешируемые a или b — лист без повторного использования
+            return Expression(self, type(operation), value=value)
+        if node is None:
+            node = self._leaves[key] = Expression(self, type(operation), value=value)
+        return node
+
+    def node(self, opcode, left, right):
+        if left.__class__ is not Expression:
+            if not isinstance(left, Operation):
+                return NotImplemented
+            left = self.leaf(left)
+        if right.__class__ is not Expression:
+            if not isinstance(right, Operation):
+                return NotImplemented
+            right = self.leaf(right)
+        kind = self.kinds[opcode]
+        # Свертка констант: x + 0, x - 0 и x * 1 дают пару x. Сворачиваем, только если пара x уже
+        # известна и результат точно совпал бы с обычным вычислением: для + и - обе части x — int
+        # (bool + 0 дает int, -0.0 + 0 дает 0.0), для * — int или float
+        if right.unit is not None or left.unit is not None:
+            neutral, types = (1, (int, float)) if opcode == "*" else (0, (int,))
+            if right.unit == neutral and _fits(left.value, types):
+                opcode, right = "=", None
+            elif left.unit == neutral and opcode != "-" and _fits(right.value, types):
+                opcode, left, right = "=", right, None
+            if opcode == "=" and left.kind is kind:
+                return left
+        # Узел ссылается на операнды, поэтому их id в ключе не переиспользуются, пока жив граф
+        key = (opcode, kind, id(left), id(right))
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = Expression(self, kind, opcode, left, right)
+        return node
+
+
+def _fits(value, types):
+    """Пара известна, и тип каждой ее части точно входит в types (bool не считается int)."""
+    return value is not None and type(value[0]) in types and type(value[1]) in types
+
+
+def _unit(value):
+    """0 или 1, если пара — (0, 0) или (1, 1) из int (bool и float не считаются), иначе None."""
+    if not _fits(value, (int,)):
+        return None
+    if value == (0, 0):
+        return 0
+    if value == (1, 1):
+        return 1
+    return None
+
+
+class OperationBatch:
+    """
+    Пакет операций: a и b лежат в непрерывных массивах (array 'q' для целых, 'd' для дробных),
+    класс каждой операции — в массиве кодов (0 — Addition, 1 — Subtraction, 2 — Multiplication).
+    Операторы +, - и * работают поэлементно, как Operation, а calculate() считает все результаты сразу:
+    через NumPy, если он установлен, иначе циклом по массивам. Целые вне int64 дают OverflowError.
+    """
+
+    kinds = (Addition, Subtraction, Multiplication)
+    opcodes = {kind: code for code, kind in enumerate(kinds)}
+
+    def __init__(self, a, b, opcodes):
+        if not len(a) == len(b) == len(opcodes):
+            raise ValueError("Массивы a, b и кодов должны быть одной длины")
+        self.a = a
+        self.b = b
+        self.codes = opcodes
+
+    @classmethod
+    def from_operations(cls, operations):
+        operations = list(operations)
+        try:
+            codes = array("B", [cls.opcodes[type(operation)] for operation in operations])
+        except KeyError as e:
+            raise TypeError(f"Неизвестная операция: {e.args[0].__name__}") from None
+        values = [operation.a for operation in operations] + [operation.b for operation in operations]
+        typecode = _typecode(values)
+        return cls(array(typecode, values[:len(operations)]), array(typecode, values[len(operations):]), codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.kinds[self.codes[index]](self.a[index], self.b[index])
+
+    def to_operations(self):
+        kinds = self.kinds
+        return [kinds[code](a, b) for code, a, b in zip(self.codes, self.a, self.b)]
+
+    def _combine(self, other, operator, kind, reverse=False):
+        if isinstance(other, OperationBatch):
+            if len(other) != len(self):
+                raise ValueError("Пакеты должны быть одной длины")
+            typecode = "d" if "d" in (self.a.typecode, other.a.typecode) else "q"
+        elif isinstance(other, Operation):
+            # Одна операция применяется ко всем элементам пакета
+            typecode = "d" if self.a.typecode == "d" else _typecode([other.a, other.b])
+        else:
+            return NotImplemented
+        a = _combine_column(self.a, other.a, operator, typecode, reverse)
+        b = _combine_column(self.b, other.b, operator, typecode, reverse)
+        # Как у Operation: класс результата задает оператор
+        return OperationBatch(a, b, array("B", [self.opcodes[kind]]) * len(self))
+
+    def __add__(self, other):
+        return self._combine(other, add, Addition)
+
+    def __sub__(self, other):
+        return self._combine(other, sub, Subtraction)
+
+    def __mul__(self, other):
+        return self._combine(other, mul, Multiplication)
+
+    # Operation слева от пакета: Operation.__add__ и др. возвращают NotImplemented
+    def __radd__(self, other):
+        return self._combine(other, add, Addition, reverse=True)
+
+    def __rsub__(self, other):
+        return self._combine(other, sub, Subtraction, reverse=True)
+
+    def __rmul__(self, other):
+        return self._combine(other, mul, Multiplication, reverse=True)
+
+    def calculate(self):
+        """Результаты calculate() всех операций в array того же типа, что a и b."""
+        a, b, codes = self.a, self.b, self.codes
+        if np is not None:
+            try:
+                kinds = np.frombuffer(codes, dtype=np.uint8)
+                left, right = _numpy_view(a), _numpy_view(b)
+                conditions = [kinds == code for code in range(3)]
+                # Считаем только те действия, которые есть в пакете
+                choices = [_numpy_apply(operator, left, right) if condition.any() else 0
+                           for condition, operator in zip(conditions, (add, sub, mul))]
+                return array(a.typecode, np.select(conditions, choices).astype(left.dtype).tobytes())
+            except OverflowError:
+                pass  # Оценка границ грубая — точный ответ даст обычный цикл
+        if len(set(codes)) == 1:
+            # Все операции одного класса — один проход map на скорости C
+            return array(a.typecode, list(map((add, sub, mul)[codes[0]], a, b)))
+        return array(a.typecode, [x + y if code == 0 else x - y if code == 1 else x * y
+                                  for code, x, y in zip(codes, a, b)])
+
+
+def _typecode(values):
+    """'q', если все значения целые (bool тоже), 'd', если есть float; иначе TypeError."""
+    types = set(map(type, values))
+    if not types <= {int, bool, float}:
+        raise TypeError("OperationBatch работает только с числами")
+    return "d" if float in types else "q"
+
+
+def _numpy_view(values):
+    """Массив NumPy поверх array без копирования."""
+    return np.frombuffer(values, dtype=np.int64 if values.typecode == "q" else np.float64)
+
+
+def _numpy_apply(operator, left, right):
+    if left.dtype == np.int64 and right.dtype == np.int64 and left.size and right.size:
+        # NumPy переполняет int64 молча — проверяем границы заранее, как array("q")
+        left_max = max(int(left.max()), -int(left.min()))
+        right_max = max(int(right.max()), -int(right.min()))
+        limit = left_max * right_max if operator is mul else left_max + right_max
+        if limit >= 2 ** 63:
+            raise OverflowError("Результат не помещается в int64")
+    return operator(left, right)
+
+
+def _combine_column(values, other, operator, typecode, reverse=False):
+    """
+    Поэлементно values (оператор) other, где other — array той же длины или одно число;
+    при reverse — other (оператор) values.
+    """
+    if np is not None:
+        dtype = np.int64 if typecode == "q" else np.float64
+        try:
+            left = _numpy_view(values).astype(dtype, copy=False)
+            right = _numpy_view(other) if isinstance(other, array) else np.asarray(other, dtype=dtype)
+            right = right.astype(dtype, copy=False)
+            if reverse:
+                left, right = right, left
+            result = _numpy_apply(operator, left, right)
+            return array(typecode, result.tobytes())
+        except OverflowError:
+            pass
+    if not isinstance(other, array):
+        other = repeat(other, len(values))
+    if reverse:
+        return array(typecode, list(map(operator, other, values)))
+    return array(typecode, list(map(operator, values, other)))
+
+
+class ParallelEvaluator:
+    """
+    Вычисление больших пакетов операций и ленивых выражений в пуле процессов. Операнды и результаты
+    лежат в общей памяти (multiprocessing.shared_memory), процессам передаются только имена блоков
+    и границы кусков. Каждый кусок пишет результат на свое место, поэтому порядок не зависит
+    от того, какой процесс закончит первым. Размер куска подбирается по замеру первого куска,
+    который считается в текущем процессе.
+    """
+
+    def __init__(self, workers=None, target_seconds=0.05, min_chunk=1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.target_seconds = target_seconds  # примерная длительность одного куска
+        self.min_chunk = min_chunk
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor  # Тяжелый импорт откладывается до первого пакета
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def chunks(self, start, end, seconds_per_item=None):
+        """Куски [start, end): по target_seconds работы, но не меньше min_chunk и хотя бы по 4 на процесс."""
+        total = end - start
+        size = -(-total // (self.workers * 4))
+        if seconds_per_item:
+            size = min(size, int(self.target_seconds / seconds_per_item))
+        size = max(size, self.min_chunk)
+        return [(i, min(i + size, end)) for i in range(start, end, size)]
+
+    def _run(self, function, names, typecode, chunks):
+        """Выполняет куски в пуле (или здесь, если кусок один) и ждет все; ошибка первого по порядку куска поднимается."""
+        if len(chunks) == 1 or self.workers == 1:
+            for start, end in chunks:
+                function(names, typecode, start, end)
+            return
+        from concurrent.futures import wait
+
+        futures = [self._pool().submit(function, names, typecode, start, end) for start, end in chunks]
+        # Общую память освобождает вызывающий, поэтому возвращаемся, только когда завершились все куски
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def calculate(self, operations):
+        """Результаты calculate() для OperationBatch или списка Operation — array в исходном порядке."""
+        batch = operations if isinstance(operations, OperationBatch) else OperationBatch.from_operations(operations)
+        typecode = batch.a.typecode
+        if not len(batch):
+            return array(typecode)
+        blocks = _share([batch.a, batch.b, batch.codes, array(typecode, bytes(8 * len(batch)))])
+        try:
+            names = [block.name for block in blocks]
+            # Первый кусок считаем здесь же — по нему выбирается размер остальных
+            probe = min(len(batch), self.min_chunk)
+            started = time.perf_counter()
+            _evaluate_chunk(names, typecode, 0, probe)
+            per_item = (time.perf_counter() - started) / probe
+            self._run(_evaluate_chunk, names, typecode, self.chunks(probe, len(batch), per_item))
+            result = array(typecode)
+            result.frombytes(blocks[3].buf[:8 * len(batch)])
+            return result
+        finally:
+            _release(blocks)
+
+    def calculate_expressions(self, expressions):
+        """
+        calculate() для списка ленивых выражений. Графы раскладываются по уровням: узел уровня k зависит
+        только от узлов уровней меньше k, так что уровень считается параллельно по кускам.
+        Пары (a, b) всех узлов запоминаются, как при обычном evaluate(). Параллельно считаются только
+        графы, где все известные пары целиком из int или целиком из float: смесь типов, bool и другие
+        значения, а также выход за int64 считаются обычным evaluate(), чтобы не запоминать приведенные значения.
+        """
+        if not expressions:
+            return []
+        # Сборщик мусора на сотнях тысяч новых объектов тратит больше времени, чем сама раскладка
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._calculate_expressions(expressions)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _calculate_expressions(self, expressions):
+        nodes, levels = _levels(expressions)
+        known, pending = nodes[:levels[0]], nodes[levels[0]:]
+        types = {type(value) for node in known for value in node.value}
+        if not pending or (types != {int} and types != {float}):
+            return [expression.calculate() for expression in expressions]
+        typecode = "q" if int in types else "d"
+        position = {node: i for i, node in enumerate(nodes)}
+        # Уже вычисленные узлы дают значения, остальные — код действия и номера операндов
+        try:
+            a = array(typecode, [node.value[0] for node in known]) + array(typecode, bytes(8 * len(pending)))
+            b = array(typecode, [node.value[1] for node in known]) + array(typecode, bytes(8 * len(pending)))
+        except OverflowError:  # Листья вне int64
+            return [expression.calculate() for expression in expressions]
+        codes = array("B", bytes(len(known)) + bytes([_NODE_CODES[node.opcode] for node in pending]))
+        left = array("q", bytes(8 * len(known)))
+        left.extend([position[node.left] for node in pending])
+        right = array("q", bytes(8 * len(known)))
+        right.extend([position[node.left if node.right is None else node.right] for node in pending])
+        blocks = _share([a, b, codes, left, right])
+        try:
+            names = [block.name for block in blocks]
+            try:
+                for start, end in zip(levels, levels[1:]):
+                    self._run(_evaluate_nodes, names, typecode, self.chunks(start, end))
+            except OverflowError:
+                # Промежуточный результат вышел за int64 — узлы ничего не запомнили, считаем обычным путем
+                return [expression.calculate() for expression in expressions]
+            a, b = blocks[0].buf.cast(typecode), blocks[1].buf.cast(typecode)
+            try:
+                for i in range(levels[0], len(nodes)):
+                    nodes[i].value = (a[i], b[i])
+            finally:
+                a.release()
+                b.release()
+        finally:
+            _release(blocks)
+        return [expression.calculate() for expression in expressions]
+
+
+# Код действия узла выражения для _evaluate_nodes
+_NODE_CODES = {"+": 0, "-": 1, "*": 2, "=": 3}
+
+
+def _levels(expressions):
+    """Узлы графов без повторов, упорядоченные по уровню, и границы уровней (уровень 0 — вычисленные узлы)."""
+    level = {}
+    stack = list(expressions)
+    while stack:
+        node = stack.pop()
+        if node in level:
+            continue
+        if node.value is not None:
+            level[node] = 0
+            continue
+        left, right = node.left, node.right
+        left_level = level.get(left)
+        right_level = left_level if right is None else level.get(right)
+        if left_level is None or right_level is None:
+            stack.append(node)
+            if left_level is None:
+                stack.append(left)
+            if right_level is None and right is not None:
+                stack.append(right)
+            continue
+        level[node] = 1 + (left_level if left_level > right_level else right_level)
+    buckets = [[] for _ in range(max(level.values()) + 1)]
+    for node, depth in level.items():
+        buckets[depth].append(node)
+    nodes = []
+    bounds = []
+    for bucket in buckets:
+        nodes.extend(bucket)
+        bounds.append(len(nodes))
+    return nodes, bounds
+
+
+def _share(arrays):
+    """Копирует массивы в новые блоки общей памяти."""
+    from multiprocessing import shared_memory
+
+    blocks = []
+    try:
+        for values in arrays:
+            data = values.tobytes()
+            block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            block.buf[:len(data)] = data
+            blocks.append(block)
+    except BaseException:
+        _release(blocks)
+        raise
+    return blocks
+
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def _attach(names):
+    from multiprocessing import shared_memory
+
+    return [shared_memory.SharedMemory(name=name) for name in names]
+
+
+def _evaluate_chunk(names, typecode, start, end):
+    """Считает кусок [start, end) пакета: блоки a, b, коды и результат."""
+    blocks = _attach(names)
+    try:
+        columns = []
+        for block, size in zip(blocks[:3], (8, 8, 1)):
+            column = array(typecode if size == 8 else "B")
+            column.frombytes(block.buf[start * size:end * size])
+            columns.append(column)
+        result = OperationBatch(*columns).calculate()
+        blocks[3].buf[start * 8:end * 8] = result.tobytes()
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _evaluate_nodes(names, typecode, start, end):
+    """Считает узлы [start, end) одного уровня выражения по уже посчитанным операндам."""
+    blocks = _attach(names)
+    views = []
+    try:
+        a, b = (blocks[0].buf.cast(typecode), blocks[1].buf.cast(typecode))
+        codes, left, right = blocks[2].buf, blocks[3].buf.cast("q"), blocks[4].buf.cast("q")
+        views = [a, b, left, right]
+        operators = (add, sub, mul)
+        for i in range(start, end):
+            l, r, code = left[i], right[i], codes[i]
+            try:
+                if code == 3:
+                    a[i], b[i] = a[l], b[l]
+                else:
+                    operator = operators[code]
+                    a[i], b[i] = operator(a[l], a[r]), operator(b[l], b[r])
+            except ValueError:
+                raise OverflowError("Результат не помещается в int64") from None
+    finally:
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+
+
+def benchmark_lazy(terms=100000):
+    """Сравнивает обычную цепочку из terms операций с ленивым графом (построение, вычисление, повторный calculate())."""
+    operations = [(Addition, Subtraction, Multiplication)[i % 3](i % 7, i % 5) for i in range(terms)]
+    start = time.perf_counter()
+    result = operations[0]
+    for operation in operations[1:]:
+        result = result + operation
+    value = result.calculate()
+    eager = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = ExpressionGraph()
+    expression = operations[0].lazy(graph)
+    for operation in operations[1:]:
+        expression = expression + operation
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    assert expression.calculate() == value
+    evaluated = time.perf_counter() - start
+    start = time.perf_counter()
+    expression.calculate()
+    repeated = time.perf_counter() - start
+    print(f"eager chain: {eager * 1000:.1f} ms")
+    print(f"lazy graph: build {built * 1000:.1f} ms, calculate {evaluated * 1000:.1f} ms, "
+          f"repeated calculate {repeated * 1e6:.1f} us, nodes {len(graph)}")
+
+    # Общие подвыражения: та же сумма строится второй раз и вычитается из первой
+    start = time.perf_counter()
+    first = second = operations[0]
+    for operation in operations[1:]:
+        first = first + operation
+    for operation in operations[1:]:
+        second = second + operation
+    (first - second).calculate()
+    eager = time.perf_counter() - start
+    start = time.perf_counter()
+    first = second = operations[0].lazy(graph)
+    for operation in operations[1:]:
+        first = first + operation
+    for operation in operations[1:]:
+        second = second + operation
+    (first - second).calculate()
+    print(f"same sum built twice: eager {eager * 1000:.1f} ms, lazy {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"shared nodes: {first is second}")
+    return eager, evaluated
+
+
+def benchmark_batch(operations=1000000):
+    """Сравнивает [op.calculate() for op in ...] и операторы над списками с OperationBatch."""
+    kinds = (Addition, Subtraction, Multiplication)
+    items = [kinds[i % 3](i % 1000, i % 777) for i in range(operations)]
+    start = time.perf_counter()
+    expected = [operation.calculate() for operation in items]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = OperationBatch.from_operations(items)
+    packed = time.perf_counter() - start
+    start = time.perf_counter()
+    results = batch.calculate()
+    vectorized = time.perf_counter() - start
+    assert results.tolist() == expected
+    print(f"calculate(): list {scalar * 1000:.0f} ms, batch {vectorized * 1000:.0f} ms "
+          f"({scalar / vectorized:.1f}x, {'numpy' if np else 'array'}), packing {packed * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    combined = [(x + y) * x for x, y in zip(items, items)]
+    scalar = time.perf_counter() - start
+    start = time.perf_counter()
+    combined_batch = (batch + batch) * batch
+    vectorized = time.perf_counter() - start
+    assert combined_batch[operations - 1].calculate() == combined[-1].calculate()
+    print(f"(x + y) * x: list {scalar * 1000:.0f} ms, batch {vectorized * 1000:.0f} ms ({scalar / vectorized:.1f}x)")
+
+    start = time.perf_counter()
+    [operation.calculate() for operation in combined]
+    scalar = time.perf_counter() - start
+    start = time.perf_counter()
+    combined_batch.calculate()
+    vectorized = time.perf_counter() - start
+    print(f"calculate() of one class: list {scalar * 1000:.0f} ms, batch {vectorized * 1000:.0f} ms "
+          f"({scalar / vectorized:.1f}x)")
+    return scalar, vectorized
+
+
+def benchmark_parallel(operations=2000000, expressions=200000, max_workers=None):
+    """Время ParallelEvaluator на 1..cpu_count() процессах для пакета операций и широкого графа выражений."""
+    kinds = (Addition, Subtraction, Multiplication)
+    batch = OperationBatch.from_operations(kinds[i % 3](i % 1000, i % 777) for i in range(operations))
+    start = time.perf_counter()
+    expected = batch.calculate()
+    print(f"OperationBatch.calculate(), one process: {(time.perf_counter() - start) * 1000:.0f} ms")
+    leaves = [kinds[i % 3](i, i % 7) for i in range(expressions + 2)]
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        with ParallelEvaluator(workers=workers) as evaluator:
+            warmup = evaluator.min_chunk * workers * 8
+            evaluator.calculate(OperationBatch(batch.a[:warmup], batch.b[:warmup], batch.codes[:warmup]))  # Запуск пула не считаем
+            start = time.perf_counter()
+            assert evaluator.calculate(batch) == expected
+            flat = time.perf_counter() - start
+
+            graph = ExpressionGraph()
+            nodes = [leaf.lazy(graph) for leaf in leaves]
+            roots = [(nodes[i] + nodes[i + 1]) * nodes[i + 2] - (nodes[i] + nodes[i + 1]) for i in range(expressions)]
+            start = time.perf_counter()
+            evaluator.calculate_expressions(roots)
+            wide = time.perf_counter() - start
+            if workers == 1:
+                graph = ExpressionGraph()
+                nodes = [leaf.lazy(graph) for leaf in leaves]
+                roots = [(nodes[i] + nodes[i + 1]) * nodes[i + 2] - (nodes[i] + nodes[i + 1])
+                         for i in range(expressions)]
+                start = time.perf_counter()
+                for root in roots:
+                    root.calculate()
+                print(f"Expression.calculate(), one process: {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"workers {workers}: batch {operations / flat:.0f} op/s, expressions {expressions / wide:.0f} expr/s")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench-lazy"]:
+        benchmark_lazy()
+    elif sys.argv[1:2] == ["bench-batch"]:
+        benchmark_batch()
+    elif sys.argv[1:2] == ["bench-parallel"]:
+        benchmark_parallel()
+    else:
+        # Пример использования
+        op1 = Addition(5, 10)
+        op2 = Subtraction(20, 5)
+        op3 = Multiplication(4, 6)
 
-# Умножение op2 * op3, затем сложение с op1
-result = op1 + op2 * op3
+        # Умножение op2 * op3, затем сложение с op1
+        result = op1 + op2 * op3
 
-print(result)  # Operation(a=5, b=10)
+        print(result)  # Operation(a=5, b=10)
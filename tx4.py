@@ -1,51 +1,249 @@
 import re
+import sys
+import time
+import queue
+import heapq
+import json
+import random
 import logging
+import functools
+import itertools
+import threading
+import collections
 import os
 
-# Создаем директорию для логов, если ее нет
-notifications_path = os.path.join(os.getcwd(), 'notifications')
-if not os.path.exists(notifications_path):
-    os.mkdir(notifications_path)
-os.chdir(notifications_path)
+class AppContext:
+    """
+    Каталог для логов и данных уведомлений. Создается при первом обращении, а не при импорте,
+    текущая директория процесса не меняется. По умолчанию: $NOTIFICATIONS_DIR или ./notifications.
+    """
+
+    def __init__(self, base_dir=None):
+        self.configure(base_dir)
+
+    def configure(self, base_dir=None):
+        self._base_dir = base_dir
+        self._ready = False
+
+    @property
+    def notifications_path(self):
+        if self._base_dir is None:
+            self._base_dir = os.environ.get('NOTIFICATIONS_DIR') or os.path.join(os.getcwd(), 'notifications')
+        if not self._ready:
+            os.makedirs(self._base_dir, exist_ok=True)
+            self._ready = True
+        return self._base_dir
+
+    def path(self, name):
+        return os.path.join(self.notifications_path, name)
+
+
+app = AppContext()
+
+class LazyRepr:
+    """Откладывает repr() до форматирования записи и обрезает слишком длинные значения."""
+
+    __slots__ = ("value", "max_length")
+
+    def __init__(self, value, max_length=None):
+        self.value = value
+        self.max_length = max_length
+
+    def __str__(self):
+        text = repr(self.value)
+        if self.max_length is not None and len(text) > self.max_length:
+            text = text[:self.max_length] + f"... (+{len(text) - self.max_length} chars)"
+        return text
+
+
+def no_log(method):
+    """Исключает метод из логирования декоратором Logerr (для горячих методов)."""
+    method._logerr_skip = True
+    return method
+
 
 class Logerr:
-    def __init__(self, log_file='log.txt'):
+    def __init__(self, log_file='log.txt', sample_rates=None, max_length=None, exclude=()):
         self.log_file = log_file
-        # Настройка логирования
-        logging.basicConfig(filename=self.log_file, level=logging.INFO)
+        # Доля логируемых вызовов по имени метода и ограничение длины аргументов
+        self.sample_rates = sample_rates or {}
+        self.max_length = max_length
+        self.exclude = set(exclude)  # Имена методов, которые не логируются
+        self._configured = False
+
+    def setup(self):
+        """Настройка логирования при первом вызове метода, а не при импорте."""
+        if not self._configured:
+            logging.basicConfig(filename=app.path(self.log_file), level=logging.INFO)
+            self._configured = True
 
     def __call__(self, cls):
         """Декоратор, логирующий вызовы методов класса."""
         for attr_name, attr_value in cls.__dict__.items():
-            if callable(attr_value) and not attr_name.startswith("__"):
+            if callable(attr_value) and not attr_name.startswith("__") and attr_name not in self.exclude:
                 # Оборачиваем методы класса в логирующий декоратор
                 setattr(cls, attr_name, self.decorator(attr_name)(attr_value))
         return cls
 
     def decorator(self, method_name):
+        sample_rate = self.sample_rates.get(method_name, 1.0)
+        max_length = self.max_length
+        logger = logging.getLogger()
+
+        def emit(level, msg, args):
+            # Запись создается напрямую, без поиска места вызова по стеку (findCaller) в logger.info
+            logger.handle(logger.makeRecord(logger.name, level, __file__, 0, msg, args, None, method_name))
+
         def log_method(method):
+            # Уже обернутые (например, при повторном применении декоратора) и исключенные методы не трогаем
+            if getattr(method, "_logerr_wrapped", False) or getattr(method, "_logerr_skip", False):
+                return method
+
+            @functools.wraps(method)
             def wrapper(instance, *args, **kwargs):
-                # Логируем вызов метода
-                logging.info(f"Calling {instance.__class__.__name__}.{method_name}() with args={args}, kwargs={kwargs}")
+                if not self._configured:
+                    self.setup()
+                # Сообщения строятся только если INFO включен и вызов попал в выборку
+                enabled = logger.isEnabledFor(logging.INFO) and (sample_rate >= 1.0 or random.random() < sample_rate)
+                if enabled:
+                    emit(logging.INFO, "Calling %s.%s() with args=%s, kwargs=%s",
+                         (instance.__class__.__name__, method_name,
+                          LazyRepr(args, max_length), LazyRepr(kwargs, max_length)))
                 try:
                     result = method(instance, *args, **kwargs)
-                    logging.info(f"{instance.__class__.__name__}.{method_name}() returned {result}")
-                    return result
                 except Exception as e:
-                    logging.error(f"Error in {instance.__class__.__name__}.{method_name}(): {e}")
+                    if logger.isEnabledFor(logging.ERROR):
+                        emit(logging.ERROR, "Error in %s.%s(): %s", (instance.__class__.__name__, method_name, e))
                     raise e
+                if enabled:
+                    emit(logging.INFO, "%s.%s() returned %s",
+                         (instance.__class__.__name__, method_name, LazyRepr(result, max_length)))
+                return result
+
+            wrapper._logerr_wrapped = True
             return wrapper
         return log_method
 
     
 @Logerr(log_file='log.txt')              
 class Notification:
+    # Слоты вместо __dict__: в очередях держатся миллионы уведомлений.
+    # _recipient хранит значение, проверенное дескриптором подкласса.
+    __slots__ = ("recipient", "message", "_recipient")
+    channel = "default"
+    batch_limit = 100  # Максимум получателей в одном запросе к провайдеру
+
     def __init__(self, recipient, message):
         self.recipient = recipient
         self.message = message
 
-    def send(self):
-        print(f"notification to {self.recipient}: {self.message}")
+    def send(self, transport=None):
+        if transport is None:
+            print(f"notification to {self.recipient}: {self.message}")
+        else:
+            transport.deliver(self.channel, self.recipient, self.message)
+
+    @classmethod
+    def send_many(cls, notifications, transport=None):
+        """
+        Отправляет уведомления пакетами: группирует по каналу и тексту сообщения, так что один запрос
+        к провайдеру уходит сразу многим получателям, убирает повторных получателей
+        и делит группы по batch_limit канала.
+        Возвращает число запросов к провайдеру.
+        """
+        transport = transport or ConsoleTransport()
+        groups = {}
+        for notification in notifications:
+            key = (notification.channel, notification.message)
+            if key not in groups:
+                groups[key] = (notification.batch_limit, [])
+            groups[key][1].append(notification.recipient)
+        requests = 0
+        for (channel, message), (limit, recipients) in groups.items():
+            recipients = list(dict.fromkeys(recipients))  # Получатели уже нормализованы дескрипторами
+            for start in range(0, len(recipients), limit):
+                transport.deliver_batch(channel, recipients[start:start + limit], message)
+                requests += 1
+        return requests
+
+
+# Регулярные выражения компилируются один раз при импорте
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_PATTERN = re.compile(r"^\+?\d{1,3}-?\d{1,14}$")
+PHONE_SEPARATORS = re.compile(r"[\s().-]")
+
+
+def normalize_email(email):
+    """Приводит адрес к одному виду, чтобы одинаковые адреса в разном регистре совпадали."""
+    if not isinstance(email, str):
+        return email
+    normalized = email.strip().casefold()
+    return email if normalized == email else normalized  # Уже нормальный адрес не копируется
+
+
+def normalize_phone(phone, region=None):
+    """
+    Убирает из номера пробелы, скобки и дефисы, "00" в начале заменяет на "+".
+    Остальные цифры не меняются: номер без "+" проверяется как есть, код страны не угадывается.
+    region — (код страны, национальный префикс), например ("7", "8"): тогда "8 911 ..." дает "+7911...".
+    """
+    if not isinstance(phone, str):
+        return phone
+    normalized = PHONE_SEPARATORS.sub("", phone.strip())
+    if normalized.startswith("00") and len(normalized) > 3:
+        normalized = "+" + normalized[2:]
+    elif not normalized.startswith("+") and region is not None:
+        country, trunk = region
+        if normalized.startswith(trunk):
+            normalized = "+" + country + normalized[len(trunk):]
+    return phone if normalized == phone else normalized
+
+
+class ValidationCache:
+    """
+    Ограниченный LRU кэш результатов проверки получателей, общий для всех дескрипторов.
+    Ключ — нормализованное значение, поэтому эквивалентные адреса и номера проверяются один раз.
+    enabled=False отключает кэш (каждое присваивание проверяется заново).
+    """
+
+    def __init__(self, max_size=100000, enabled=True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, kind, value, validator):
+        if not self.enabled:
+            return validator(value)
+        key = (kind, value)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = validator(value)
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._results),
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+validation_cache = ValidationCache()
 
 
 class EmailValidate:
@@ -55,21 +253,26 @@ class EmailValidate:
     @staticmethod
     def is_valid_email(email):
         # Регулярное выражение для проверки адреса электронной почты
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return re.match(pattern, email) is not None
+        return EMAIL_PATTERN.match(email) is not None
 
     def __set__(self, instance, value):
-        if self.is_valid_email(value):
-            instance.__dict__[self.name] = value
+        value = normalize_email(value)
+        if validation_cache.check("email", value, self.is_valid_email):
+            setattr(instance, self.name, value)
         else:
             raise ValueError("Invalid email address")
 
     def __get__(self, instance, owner):
-        return instance.__dict__[self.name]
+        if instance is None:
+            return self
+        return getattr(instance, self.name)
 
 
 @Logerr(log_file='log.txt')
 class EmailNotification(Notification):
+    __slots__ = ()
+    channel = "email"
+    batch_limit = 1000
     recipient = EmailValidate()
 
     def __init__(self, recipient, message):
@@ -83,21 +286,26 @@ class SMSValidation:
     @staticmethod
     def is_valid_phone(phone):
         # Регулярное выражение для проверки номера телефона
-        pattern = r"^\+?\d{1,3}-?\d{1,14}$"
-        return re.match(pattern, phone) is not None
+        return PHONE_PATTERN.match(phone) is not None
 
     def __set__(self, instance, value):
-        if self.is_valid_phone(value):
-            instance.__dict__[self.name] = value
+        value = normalize_phone(value)
+        if validation_cache.check("sms", value, self.is_valid_phone):
+            setattr(instance, self.name, value)
         else:
             raise ValueError("Invalid phone number")
 
     def __get__(self, instance, owner):
-        return instance.__dict__[self.name]
+        if instance is None:
+            return self
+        return getattr(instance, self.name)
 
 
 @Logerr(log_file='log.txt')
 class SMSNotification(Notification):
+    __slots__ = ()
+    channel = "sms"
+    batch_limit = 500
     recipient = SMSValidation()
 
     def __init__(self, recipient, message):
@@ -116,27 +324,806 @@ class PushValidation:
 
     def __set__(self, instance, value):
         if self.is_valid_token(value):
-            instance.__dict__[self.name] = value
+            setattr(instance, self.name, value)
 
     def __get__(self, instance, owner):
-        return instance.__dict__[self.name]
+        if instance is None:
+            return self
+        return getattr(instance, self.name)
 
 
 @Logerr(log_file='log.txt')
 class PushNotification(Notification):
+    __slots__ = ()
+    channel = "push"
+    batch_limit = 500
     recipient = PushValidation()
 
     def __init__(self, recipient, message):
         super().__init__(recipient, message)
 
 
-# Пример использования
+# Класс уведомления по имени канала (для восстановления из Outbox)
+CHANNEL_CLASSES = {cls.channel: cls for cls in (EmailNotification, SMSNotification, PushNotification)}
+
+
+BulkValidation = collections.namedtuple("BulkValidation", "mask reasons")
+
+# Нормализация, шаблон и сообщение об ошибке для каждого канала; у push проверяется только наличие токена
+CHANNEL_RULES = {
+    "email": (normalize_email, EMAIL_PATTERN, "Invalid email address"),
+    "sms": (normalize_phone, PHONE_PATTERN, "Invalid phone number"),
+    "push": (None, None, "Token is required"),
+}
+
+
+def validate_many(channel, recipients):
+    """
+    Проверяет сразу весь столбец получателей канала.
+    Возвращает BulkValidation: mask — список bool, reasons — причина отказа или None для каждой строки.
+    """
+    normalize, pattern, reason = CHANNEL_RULES[channel]
+    if pattern is None:
+        mask = [recipient is not None for recipient in recipients]
+    else:
+        match = pattern.match
+        mask = [isinstance(recipient, str) and match(normalize(recipient)) is not None for recipient in recipients]
+    return BulkValidation(mask, [None if ok else reason for ok in mask])
+
+
+def validate_file(channel, path, chunk_size=100000, workers=None):
+    """
+    Потоково проверяет файл с одним получателем на строке, не загружая его целиком.
+    Отдает пары (получатели блока, BulkValidation) в порядке файла; workers > 1 — проверка блоков в пуле процессов.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        chunks = iter(lambda: [line.rstrip("\n") for line in itertools.islice(f, chunk_size)], [])
+        if not workers or workers == 1:
+            for chunk in chunks:
+                yield chunk, validate_many(channel, chunk)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = collections.deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(validate_many, channel, chunk)))
+                # Не больше двух блоков на процесс в полете, чтобы память не росла с размером файла
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    yield chunk, future.result()
+            while pending:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+
+class Transport:
+    """Интерфейс доставки уведомлений провайдеру канала."""
+
+    def deliver(self, channel, recipient, message):
+        raise NotImplementedError("Метод deliver() должен быть реализован в подклассе")
+
+    def deliver_batch(self, channel, recipients, message):
+        """Отправляет одно сообщение многим получателям; провайдеры с пакетным API переопределяют метод."""
+        for recipient in recipients:
+            self.deliver(channel, recipient, message)
+
+
+class ConsoleTransport(Transport):
+    def deliver(self, channel, recipient, message):
+        print(f"notification to {recipient}: {message}")
+
+
+class LocalTransport(Transport):
+    """Локальная замена провайдера для тестов: запоминает доставленные сообщения и имитирует задержку."""
+
+    def __init__(self, latency=0.0, keep=True):
+        self.latency = latency
+        self.keep = keep
+        self.delivered = []
+
+    def deliver(self, channel, recipient, message):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.keep:
+            self.delivered.append((channel, recipient, message))
+
+    def deliver_batch(self, channel, recipients, message):
+        # Один запрос на пакет: задержка провайдера платится один раз
+        if self.latency:
+            time.sleep(self.latency)
+        if self.keep:
+            self.delivered.extend((channel, recipient, message) for recipient in recipients)
+
+
+class NotificationDispatcher:
+    """
+    Отправка уведомлений пулом потоков: у каждого канала своя ограниченная очередь
+    и свое число рабочих потоков (concurrency). Когда очередь канала заполнена,
+    submit() ждет освобождения места — так отправитель не обгоняет провайдера.
+    """
+
+    def __init__(self, transport, concurrency=None, max_queue=10000, default_concurrency=4):
+        self.transport = transport
+        self.concurrency = concurrency or {}
+        self.default_concurrency = default_concurrency
+        self.max_queue = max_queue
+        self.sent = 0
+        self.failed = 0
+        self.latencies = collections.deque(maxlen=100000)  # задержки последних сообщений, с
+        self._queues = {}
+        self._threads = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _queue_for(self, channel):
+        with self._lock:
+            channel_queue = self._queues.get(channel)
+            if channel_queue is None:
+                channel_queue = self._queues[channel] = queue.Queue(maxsize=self.max_queue)
+                for _ in range(self.concurrency.get(channel, self.default_concurrency)):
+                    thread = threading.Thread(target=self._worker, args=(channel_queue,), daemon=True)
+                    thread.start()
+                    self._threads.append((channel_queue, thread))
+            return channel_queue
+
+    def submit(self, notification, timeout=None):
+        """Ставит уведомление в очередь его канала; при timeout и полной очереди — queue.Full."""
+        self._queue_for(notification.channel).put((notification, time.perf_counter()), timeout=timeout)
+
+    def _worker(self, channel_queue):
+        while True:
+            item = channel_queue.get()
+            if item is None:
+                return
+            notification, submitted = item
+            try:
+                self.transport.deliver(notification.channel, notification.recipient, notification.message)
+                ok = True
+            except Exception as e:
+                logging.error("Error delivering %s to %s: %s", notification.channel, notification.recipient, e)
+                ok = False
+            with self._lock:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                self.latencies.append(time.perf_counter() - submitted)
+
+    def close(self):
+        """Дожидается отправки всех поставленных уведомлений и останавливает потоки."""
+        for channel_queue, _ in self._threads:
+            channel_queue.put(None)
+        for _, thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._queues = {}
+
+    def stats(self):
+        elapsed = time.perf_counter() - self._started
+        latencies = sorted(self.latencies)
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+        return {"sent": self.sent, "failed": self.failed,
+                "per_second": self.sent / elapsed if elapsed else 0.0, "p99_latency": p99}
+
+
+class TokenBucket:
+    """Корзина токенов: rate токенов в секунду, не больше capacity за раз."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity=None, now=0.0):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = now
+
+    def delay(self, now):
+        """Через сколько секунд появится токен (0 — уже есть)."""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        # Допуск на ошибку округления: иначе модельные часы могут застрять на бесконечно малых шагах
+        return 0.0 if self.tokens >= 1 - 1e-9 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class SimulatedClock:
+    """Модельное время для проверки планировщика: clock() возвращает время, sleep() его сдвигает."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimitedScheduler:
+    """
+    Отправка с ограничением частоты: у каждого канала своя корзина токенов (rates = {канал: (в секунду, запас)}),
+    по желанию — еще и у каждого получателя (recipient_rate). Очередь канала — куча по приоритету,
+    поэтому срочные сообщения обгоняют массовые. poll() отправляет все, что разрешено сейчас,
+    и возвращает время до следующей возможной отправки, так что ожидание идет без холостых циклов.
+    """
+
+    URGENT = 0
+    NORMAL = 5
+    BULK = 10
+
+    def __init__(self, transport, rates=None, recipient_rate=None, clock=None, max_recipients=10000):
+        self.transport = transport
+        self.rates = rates or {}
+        self.recipient_rate = recipient_rate
+        self.clock = clock or time.monotonic
+        self.max_recipients = max_recipients
+        self.sent = collections.Counter()
+        self.failed = 0
+        self.waits = collections.defaultdict(list)  # приоритет -> время ожидания сообщений, с
+        self._queues = {}  # канал -> куча (приоритет, номер, время постановки, уведомление)
+        self._deferred = {}  # канал -> куча (время готовности, элемент) — ждут корзину получателя
+        self._buckets = {}
+        self._recipient_buckets = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._dirty = False  # с последнего poll() поставлены новые сообщения
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, notification, priority=NORMAL):
+        """Ставит уведомление в очередь его канала; меньшее значение priority — более срочное."""
+        with self._cond:
+            channel_queue = self._queues.get(notification.channel)
+            if channel_queue is None:
+                channel_queue = self._queues[notification.channel] = []
+                self._deferred[notification.channel] = []
+                rate = self.rates.get(notification.channel)
+                if rate is not None:
+                    self._buckets[notification.channel] = TokenBucket(*rate, now=self.clock())
+            heapq.heappush(channel_queue, (priority, next(self._counter), self.clock(), notification))
+            self._dirty = True
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return sum(len(q) for q in self._queues.values()) + sum(len(q) for q in self._deferred.values())
+
+    def _recipient_bucket(self, channel, recipient, now):
+        key = (channel, recipient)
+        bucket = self._recipient_buckets.get(key)
+        if bucket is None:
+            if len(self._recipient_buckets) >= self.max_recipients:
+                # Полные корзины ничего не ограничивают — их можно забыть
+                for stale in [k for k, b in self._recipient_buckets.items() if b.delay(now) == 0.0
+                              and b.tokens >= b.capacity]:
+                    del self._recipient_buckets[stale]
+            bucket = self._recipient_buckets[key] = TokenBucket(*self.recipient_rate, now=now)
+        return bucket
+
+    def _take_ready(self, now):
+        """Выбирает разрешенные сейчас сообщения; возвращает их и задержку до следующей попытки."""
+        ready = []
+        next_delay = None
+        for channel, channel_queue in self._queues.items():
+            deferred = self._deferred[channel]
+            bucket = self._buckets.get(channel)
+            while deferred and deferred[0][0] <= now + 1e-9:
+                heapq.heappush(channel_queue, heapq.heappop(deferred)[1])
+            delay = None
+            while channel_queue:
+                delay = bucket.delay(now) if bucket is not None else 0.0
+                if delay:
+                    break
+                item = heapq.heappop(channel_queue)
+                if self.recipient_rate is not None:
+                    recipient_bucket = self._recipient_bucket(channel, item[3].recipient, now)
+                    wait = recipient_bucket.delay(now)
+                    if wait:
+                        heapq.heappush(deferred, (now + wait, item))
+                        continue
+                    recipient_bucket.take()
+                if bucket is not None:
+                    bucket.take()
+                ready.append(item)
+                delay = None
+            if deferred:
+                wait = deferred[0][0] - now
+                delay = wait if delay is None else min(delay, wait)
+            if delay is not None:
+                next_delay = delay if next_delay is None else min(next_delay, delay)
+        return ready, next_delay
+
+    def poll(self):
+        """Отправляет все сообщения, разрешенные корзинами сейчас. Возвращает задержку до следующей отправки или None."""
+        with self._cond:
+            now = self.clock()
+            ready, delay = self._take_ready(now)
+        for priority, _, submitted, notification in ready:
+            try:
+                self.transport.deliver(notification.channel, notification.recipient, notification.message)
+                self.sent[notification.channel] += 1
+            except Exception as e:
+                logging.error("Error delivering %s to %s: %s", notification.channel, notification.recipient, e)
+                self.failed += 1
+            self.waits[priority].append(now - submitted)
+        return delay
+
+    def drain(self, sleep=None):
+        """Отправляет все поставленные сообщения, засыпая между окнами (для модельного времени — clock.sleep)."""
+        sleep = sleep or time.sleep
+        while True:
+            delay = self.poll()
+            if delay is None:
+                return
+            sleep(delay)
+
+    def start(self):
+        """Запускает отправку в фоновом потоке; поток спит до ближайшего токена или нового сообщения."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._dirty = False
+            delay = self.poll()
+            with self._cond:
+                # submit() во время доставки будит поток, когда он еще не ждет, — проверяем флаг
+                if self._dirty:
+                    continue
+                if delay is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                elif delay:
+                    self._cond.wait(delay)
+
+    def close(self):
+        """Дожидается отправки всех поставленных сообщений и останавливает поток."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main():
+    # Пример использования
+
+    notification = EmailNotification("john@example.com", "Hello, world!")
+    notification.send()
+
+    sms_notification = SMSNotification("+79111234567", "Help, I'm in danger!")
+    sms_notification.send()
+
+    push_notification = PushNotification("my_push_token", "Don't forget to check your notifications!")
+    push_notification.send()
+
+
+class Outbox:
+    """
+    Надежная очередь уведомлений на диске (каталог outbox внутри notifications).
+    Сообщения дописываются строками JSON в сегменты segment-<первый номер>.log, fsync выполняется
+    раз в batch_size сообщений или при flush(). Каждый потребитель хранит номер последнего
+    подтвержденного сообщения в offset-<имя>; после перезапуска неподтвержденные сообщения
+    читаются заново (доставка «хотя бы один раз»), а compact() удаляет полностью подтвержденные сегменты.
+    """
+
+    def __init__(self, path=None, batch_size=1000, segment_size=100000):
+        self.path = path or app.path("outbox")
+        self.batch_size = batch_size
+        self.segment_size = segment_size
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._recover()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _segments(self):
+        """Пары (номер первого сообщения, путь) по возрастанию."""
+        segments = []
+        for name in os.listdir(self.path):
+            if name.startswith("segment-") and name.endswith(".log"):
+                segments.append((int(name[len("segment-"):-len(".log")]), os.path.join(self.path, name)))
+        return sorted(segments)
+
+    def _recover(self):
+        """Находит номер последнего сообщения и отрезает недописанную при сбое строку."""
+        self.next_seq = 1
+        self._segment_count = 0
+        self._tail = None
+        segments = self._segments()
+        if not segments:
+            return
+        first_seq, path = segments[-1]
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        self._segment_count = data[:end].count(b"\n")
+        self.next_seq = first_seq + self._segment_count
+        self._tail = path
+
+    def _open_segment(self):
+        if self._file is None or self._segment_count >= self.segment_size:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+            if self._tail is not None and self._segment_count < self.segment_size:
+                path = self._tail  # Дописываем последний сегмент, оставшийся с прошлого запуска
+            else:
+                path = os.path.join(self.path, f"segment-{self.next_seq:012d}.log")
+                self._segment_count = 0
+            self._tail = None
+            self._file = open(path, "a", encoding="utf-8")
+            self._sync_dir()
+        return self._file
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _sync_dir(self):
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def append(self, notification):
+        """Сохраняет уведомление и возвращает его номер."""
+        record = {"channel": notification.channel, "recipient": notification.recipient,
+                  "message": notification.message}
+        with self._lock:
+            segment = self._open_segment()
+            seq = self.next_seq
+            record["seq"] = seq
+            segment.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.next_seq += 1
+            self._segment_count += 1
+            self._unsynced += 1
+            if self._unsynced >= self.batch_size:
+                self._sync()
+        return seq
+
+    def flush(self):
+        with self._lock:
+            self._sync()
+
+    def close(self):
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._tail = self._file.name
+                self._file = None
+
+    def _offset_path(self, consumer):
+        return os.path.join(self.path, f"offset-{consumer}")
+
+    def offset(self, consumer="default"):
+        """Номер последнего подтвержденного потребителем сообщения (0 — ничего не подтверждено)."""
+        try:
+            with open(self._offset_path(consumer), "r", encoding="utf-8") as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def ack(self, seq, consumer="default"):
+        """Подтверждает доставку всех сообщений до seq включительно (атомарная замена файла)."""
+        path = self._offset_path(consumer)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(str(seq))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def pending(self, consumer="default"):
+        """Генератор (номер, уведомление) для неподтвержденных сообщений — воспроизведение после перезапуска."""
+        self.flush()
+        acked = self.offset(consumer)
+        segments = self._segments()
+        for index, (first_seq, path) in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1][0] <= acked + 1:
+                continue  # Сегмент подтвержден целиком
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # Строка еще дописывается
+                    record = json.loads(line)
+                    if record["seq"] > acked:
+                        cls = CHANNEL_CLASSES.get(record["channel"], Notification)
+                        yield record["seq"], cls(record["recipient"], record["message"])
+
+    def drain(self, transport, consumer="default", batch=1000):
+        """Отправляет неподтвержденные сообщения пакетами через send_many и подтверждает каждый пакет."""
+        sent = 0
+        chunk = []
+        for seq, notification in self.pending(consumer):
+            chunk.append(notification)
+            if len(chunk) >= batch:
+                Notification.send_many(chunk, transport)
+                self.ack(seq, consumer)
+                sent += len(chunk)
+                chunk = []
+        if chunk:
+            Notification.send_many(chunk, transport)
+            self.ack(seq, consumer)
+            sent += len(chunk)
+        return sent
+
+    def compact(self):
+        """Удаляет сегменты, все сообщения которых подтверждены каждым потребителем. Возвращает число удаленных."""
+        consumers = [name[len("offset-"):] for name in os.listdir(self.path)
+                     if name.startswith("offset-") and not name.endswith(".tmp")]
+        if not consumers:
+            return 0
+        acked = min(self.offset(consumer) for consumer in consumers)
+        removed = 0
+        with self._lock:
+            segments = self._segments()
+            # Последний (текущий) сегмент не удаляется
+            for (first_seq, path), (next_first, _) in zip(segments, segments[1:]):
+                if next_first - 1 <= acked:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+
+def benchmark_logerr(calls=20000):
+    """Измеряет накладные расходы Logerr на один вызов (мкс): INFO включен, выключен, выборка 1% и no_log."""
+    class Bench:
+        def action(self, value):
+            return value
+
+        def sampled(self, value):
+            return value
+
+        @no_log
+        def excluded(self, value):
+            return value
+
+    raw_action = Bench.action
+    Bench = Logerr(log_file='log.txt', max_length=100, sample_rates={"sampled": 0.01})(Bench)
+    instance = Bench()
+    payload = "x" * 10000
+    root = logging.getLogger()
+    level = root.level
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        raw_action(instance, payload)
+    baseline = time.perf_counter() - start
+
+    results = {}
+    modes = (("on", logging.INFO, instance.action), ("off", logging.WARNING, instance.action),
+             ("sampled 1%", logging.INFO, instance.sampled), ("no_log", logging.INFO, instance.excluded))
+    for mode, mode_level, method in modes:
+        root.setLevel(mode_level)
+        start = time.perf_counter()
+        for _ in range(calls):
+            method(payload)
+        results[mode] = (time.perf_counter() - start - baseline) / calls * 1e6
+    root.setLevel(level)
+    for mode, overhead in results.items():
+        print(f"logging {mode}: {overhead:.2f} us/call")
+    return results
+
+
+def benchmark_dispatcher(messages=100000, latency=0.0005, concurrency=16):
+    """Отправляет messages уведомлений через LocalTransport с задержкой latency и печатает скорость и p99."""
+    transport = LocalTransport(latency=latency, keep=False)
+    classes = [(EmailNotification, "user{}@example.com"), (SMSNotification, "+7911{:07d}"),
+               (PushNotification, "token_{}")]
+    notifications = [cls(recipient.format(i), "Hello!") for i in range(messages)
+                     for cls, recipient in [classes[i % 3]]]
+    dispatcher = NotificationDispatcher(transport, default_concurrency=concurrency, max_queue=1000)
+    with dispatcher:
+        for notification in notifications:
+            dispatcher.submit(notification)
+    stats = dispatcher.stats()
+    print(f"sent: {stats['sent']}, {stats['per_second']:.0f} msg/s, p99 latency: {stats['p99_latency'] * 1000:.2f} ms")
+    return stats
+
+
+def benchmark_send_many(messages=100000):
+    """Сравнивает отправку messages уведомлений через send() и через send_many() (уведомлений в секунду)."""
+    transport = LocalTransport(keep=False)
+    bodies = ["Your code is 1234", "Sale starts today!", "Don't forget to check your notifications!"]
+    notifications = [SMSNotification(f"+7911{i:07d}", bodies[i % 3]) if i % 2 else
+                     EmailNotification(f"user{i}@example.com", bodies[i % 3]) for i in range(messages)]
+    results = {}
+
+    start = time.perf_counter()
+    for notification in notifications:
+        notification.send(transport)
+    results["send"] = messages / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    requests = Notification.send_many(notifications, transport)
+    results["send_many"] = messages / (time.perf_counter() - start)
+
+    print(f"send(): {results['send']:.0f} msg/s, {messages} requests")
+    print(f"send_many(): {results['send_many']:.0f} msg/s, {requests} requests")
+    return results
+
+
+def benchmark_validation(rows=200000):
+    """Сравнивает проверку получателей созданием EmailNotification по одному и validate_many (строк в секунду)."""
+    recipients = [f"user{i}@example.com" if i % 10 else f"broken-{i}" for i in range(rows)]
+    results = {}
+
+    start = time.perf_counter()
+    valid = 0
+    for recipient in recipients:
+        try:
+            EmailNotification(recipient, "Hello!")
+            valid += 1
+        except ValueError:
+            pass
+    results["per_object"] = rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = validate_many("email", recipients)
+    results["validate_many"] = rows / (time.perf_counter() - start)
+    assert sum(result.mask) == valid
+
+    for mode, rate in results.items():
+        print(f"{mode}: {rate:.0f} rows/s")
+    return results
+
+
+def benchmark_memory(count=100000):
+    """Сравнивает память на одно уведомление (байт, tracemalloc): хранение в __dict__ и слоты."""
+    import tracemalloc
+
+    class DictNotification:
+        # Прежняя раскладка: проверенный получатель и сообщение в __dict__ экземпляра
+        def __init__(self, recipient, message):
+            self.__dict__["_recipient"] = recipient
+            self.message = message
+
+    recipients = [f"user{i}@example.com" for i in range(count)]
+    message = "Hello!"
+    results = {}
+    # Кэш проверок ограничен и не относится к самим уведомлениям, поэтому на время замера он выключен
+    cache_enabled, validation_cache.enabled = validation_cache.enabled, False
+    for mode, cls in (("dict", DictNotification), ("slots", EmailNotification)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        queued = [cls(recipient, message) for recipient in recipients]
+        results[mode] = (tracemalloc.get_traced_memory()[0] - before) / count
+        tracemalloc.stop()
+        del queued
+    validation_cache.enabled = cache_enabled
+    for mode, size in results.items():
+        print(f"{mode}: {size:.0f} bytes/notification")
+    return results
+
+
+def benchmark_outbox(messages=100000, batch_size=1000):
+    """Измеряет скорость записи в Outbox с fsync раз в batch_size сообщений и скорость доставки из него."""
+    import tempfile
+
+    notifications = [EmailNotification(f"user{i}@example.com", "Hello!") for i in range(messages)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        with Outbox(tmp, batch_size=batch_size, segment_size=messages // 10) as outbox:
+            start = time.perf_counter()
+            for notification in notifications:
+                outbox.append(notification)
+            outbox.flush()
+            results["append"] = messages / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            outbox.drain(LocalTransport(keep=False))
+            results["drain"] = messages / (time.perf_counter() - start)
+            removed = outbox.compact()
+    for mode, rate in results.items():
+        print(f"{mode}: {rate:.0f} msg/s")
+    print(f"compacted segments: {removed}")
+    return results
+
+
+def benchmark_scheduler(messages=1000, urgent=50, rate=100, burst=10):
+    """
+    Моделирует отправку messages массовых и urgent срочных SMS при лимите rate в секунду на модельных часах
+    и проверяет реальный поток: достигнутую частоту и процессорное время (без холостого ожидания).
+    """
+    clock = SimulatedClock()
+    scheduler = RateLimitedScheduler(LocalTransport(keep=False), rates={"sms": (rate, burst)}, clock=clock)
+    for i in range(messages):
+        scheduler.submit(SMSNotification(f"+7911{i:07d}", "Sale starts today!"), RateLimitedScheduler.BULK)
+    clock.sleep(1.0)
+    for i in range(urgent):
+        scheduler.submit(SMSNotification(f"+7912{i:07d}", "Your code is 1234"), RateLimitedScheduler.URGENT)
+    scheduler.drain(clock.sleep)
+    waits = {priority: sum(w) / len(w) for priority, w in scheduler.waits.items()}
+    print(f"simulated: {scheduler.sent['sms']} sms in {clock.now:.2f} s "
+          f"({scheduler.sent['sms'] / clock.now:.1f}/s, limit {rate}/s)")
+    print(f"mean wait: urgent {waits[RateLimitedScheduler.URGENT]:.2f} s, bulk {waits[RateLimitedScheduler.BULK]:.2f} s")
+
+    live_rate = rate * 20
+    scheduler = RateLimitedScheduler(LocalTransport(keep=False), rates={"sms": (live_rate, burst)}).start()
+    start, cpu = time.perf_counter(), time.process_time()
+    with scheduler:
+        for i in range(live_rate):
+            scheduler.submit(SMSNotification(f"+7911{i:07d}", "Hello!"))
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu
+    print(f"live: {scheduler.sent['sms']} sms in {elapsed:.2f} s ({scheduler.sent['sms'] / elapsed:.0f}/s, "
+          f"limit {live_rate}/s), cpu {cpu:.2f} s")
+    return waits
+
+
+def benchmark_import(runs=5):
+    """Измеряет время импорта модуля (мс, медиана) по данным python -X importtime в отдельном процессе."""
+    import subprocess
 
-notification = EmailNotification("john@example.com", "Hello, world!")
-notification.send()
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    # Байткод должен кэшироваться, иначе измеряется компиляция исходника; первый запуск прогревает кэш
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    timings = []
+    for run in range(runs + 1):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, env=env,
+        )
+        if run == 0:
+            continue
+        for line in completed.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                timings.append(int(parts[1]) / 1000)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"import {module}: {median:.1f} ms")
+    return median
 
-sms_notification = SMSNotification("+79111234567", "Help, I'm in danger!")
-sms_notification.send()
 
-push_notification = PushNotification("my_push_token", "Don't forget to check your notifications!")
-push_notification.send()
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        benchmark_logerr()
+    elif sys.argv[1:2] == ["bench-import"]:
+        benchmark_import()
+    elif sys.argv[1:2] == ["bench-dispatch"]:
+        benchmark_dispatcher()
+    elif sys.argv[1:2] == ["bench-send-many"]:
+        benchmark_send_many()
+    elif sys.argv[1:2] == ["bench-validate"]:
+        benchmark_validation()
+    elif sys.argv[1:2] == ["bench-memory"]:
+        benchmark_memory()
+    elif sys.argv[1:2] == ["bench-outbox"]:
+        benchmark_outbox()
+    elif sys.argv[1:2] == ["bench-scheduler"]:
+        benchmark_scheduler()
+    else:
+        main()